@@ -0,0 +1,289 @@
+"""Benchmark the gettext transformer over the synthetic Django apps.
+
+Generates the apps with the models with many fields, TextChoices, abstract bases with clean methods raising
+ValidationError and ModelAdmin classes with @admin.display, then rewrites them with the serial update_py_files
+and the pooled add_gettext_for_files of the translate command. Measures the files per second, the peak memory
+and the time split between the parse, visit and unparse stages, summed up over the files.
+
+The peak memory is the traced python allocations of the serial run and the peak RSS of the pool workers.
+Every pooled case runs in a fresh process, the RSS of the children is kept for the whole process lifetime.
+The results are compared to the stored baseline, the run fails if the files per second drop or the peak memory
+grows by more than the tolerance.
+
+Usage:
+    python benchmarks/bench_transformers.py --sizes 100 1000 3000
+    python benchmarks/bench_transformers.py --update-baseline
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+MODES = ("serial", "pooled")
+STAGES = ("parse", "transform", "unparse")
+FIELDS_PER_MODEL = 20
+CHOICES = 6
+
+
+def generate_models_file(number: int) -> str:
+    choices = "\n".join(f'    CHOICE_{index} = "choice_{index}", "Choice {index}"' for index in range(CHOICES))
+    fields = "\n".join(
+        f'    field_{index} = models.CharField("field {index}", max_length=100, help_text="The field {index}")'
+        if index % 3 == 0
+        else f"    field_{index} = models.IntegerField(default={index})"
+        if index % 3 == 1
+        else f'    field_{index} = models.ForeignKey("auth.User", related_name="items_{number}_{index}", '
+        "on_delete=models.CASCADE)"
+        for index in range(FIELDS_PER_MODEL)
+    )
+    return f"""from django.core.exceptions import ValidationError
+from django.db import models
+
+
+class Status{number}(models.TextChoices):
+{choices}
+
+
+class Base{number}(models.Model):
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        abstract = True
+        verbose_name = "base {number}"
+
+
+class Item{number}(Base{number}):
+    status = models.CharField(max_length=20, choices=Status{number}.choices)
+{fields}
+
+    class Meta:
+        verbose_name = "item {number}"
+        verbose_name_plural = "items {number}"
+
+    def clean(self):
+        if self.field_1 < 0:
+            raise ValidationError("The field must not be negative")
+"""
+
+
+def generate_admin_file(number: int) -> str:
+    displays = "\n\n".join(
+        f"""    @admin.display(description="column {index}", ordering="field_{index}")
+    def column_{index}(self, obj):
+        return obj.field_{index}"""
+        for index in range(0, FIELDS_PER_MODEL, 4)
+    )
+    return f"""from django.contrib import admin
+
+
+class Item{number}Admin(admin.ModelAdmin):
+    list_display = ("id", "status")
+
+{displays}
+"""
+
+
+def generate_apps(root: Path, *, size: int) -> list[Path]:
+    """Generate the synthetic apps, every app has ten models files and ten admin files.
+
+    Args:
+        root (Path): The directory to generate the apps in.
+        size (int): The number of the files.
+
+    Returns:
+        list[Path]: The generated file paths.
+    """
+    file_paths = []
+    for number in range(size):
+        app = root.joinpath(f"app_{number // 20}")
+        app.mkdir(parents=True, exist_ok=True)
+        if number % 2 == 0:
+            file_path = app.joinpath(f"models_{number}.py")
+            file_path.write_text(generate_models_file(number))
+        else:
+            file_path = app.joinpath(f"admin_{number}.py")
+            file_path.write_text(generate_admin_file(number))
+        file_paths.append(file_path)
+    return file_paths
+
+
+def run_serial(file_paths: list[Path], *, jobs: int) -> tuple[list, float]:  # noqa: ARG001
+    from django_translate_gettext.services.files import update_py_files
+
+    started_at = time.perf_counter()
+    results = update_py_files(file_paths)
+    return results, time.perf_counter() - started_at
+
+
+def run_pooled(file_paths: list[Path], *, jobs: int) -> tuple[list, float]:
+    from django_translate_gettext.management.commands.translate import Command, FileToGettext
+
+    command = Command(stdout=io.StringIO())
+    files = [FileToGettext(file_path=file_path, formatted=False) for file_path in file_paths]
+    started_at = time.perf_counter()
+    results = command.add_gettext_for_files(files=files, jobs=jobs)
+    return results, time.perf_counter() - started_at
+
+
+def measure_serial_memory(template: Path, size: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copytree(template, directory, dirs_exist_ok=True)
+        file_paths = sorted(Path(directory).rglob("*.py"))
+        tracemalloc.start()
+        run_serial(file_paths, jobs=1)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert len(file_paths) == size
+    return peak / 1024 / 1024
+
+
+def run_case(*, mode: str, template: Path, size: int, jobs: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copytree(template, directory, dirs_exist_ok=True)
+        file_paths = sorted(Path(directory).rglob("*.py"))
+        runner = run_pooled if mode == "pooled" else run_serial
+        results, elapsed = runner(file_paths, jobs=jobs)
+
+    errors = [result for result in results if result.error]
+    if errors:
+        raise RuntimeError(f"Failed to rewrite {errors[0].file_path}: {errors[0].error}")
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    for result in results:
+        for stage, seconds in (result.timings or {}).items():
+            timings[stage] += seconds
+
+    if mode == "pooled":
+        peak_memory = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    else:
+        peak_memory = measure_serial_memory(template, size)
+    return {
+        "mode": mode,
+        "size": size,
+        "seconds": round(elapsed, 4),
+        "files_per_second": round(len(results) / elapsed, 1),
+        "changed": sum(result.changed for result in results),
+        "wraps": sum(result.wraps for result in results),
+        "peak_memory_mb": round(peak_memory, 2),
+        "timings": {"parse": timings["parse"], "visit": timings["transform"], "unparse": timings["unparse"]},
+    }
+
+
+def run_isolated_case(*, mode: str, template: Path, size: int, jobs: int) -> dict:
+    """Run the case in the fresh python process, so the peak RSS of the pool workers belongs to this case only.
+
+    Args:
+        mode (str): The benchmark mode.
+        template (Path): The generated apps directory.
+        size (int): The number of the files.
+        jobs (int): The pool processes.
+
+    Returns:
+        dict: The case result.
+    """
+    case = json.dumps({"mode": mode, "template": str(template), "size": size, "jobs": jobs})
+    arguments = [sys.executable, __file__, "--case", case]
+    process = subprocess.run(arguments, capture_output=True, text=True, check=True)  # noqa: S603
+    return json.loads(process.stdout)
+
+
+def compare_baseline(results: list[dict], baseline: dict, *, tolerance: float) -> list[str]:
+    """Compare the results to the baseline.
+
+    Args:
+        results (list[dict]): The benchmark results.
+        baseline (dict): The baseline results by the case key.
+        tolerance (float): The allowed relative regression.
+
+    Returns:
+        list[str]: The regressions.
+    """
+    regressions = []
+    for result in results:
+        key = f"{result['mode']}-{result['size']}"
+        if key not in baseline:
+            continue
+        expected = baseline[key]
+        if result["files_per_second"] < expected["files_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {result['files_per_second']} files/s, the baseline is {expected['files_per_second']}"
+            )
+        if result["peak_memory_mb"] > expected["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: {result['peak_memory_mb']} MB peak memory, the baseline is {expected['peak_memory_mb']}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 3000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--jobs", type=int, default=max(os.cpu_count() or 1, 2), help="The pool processes, 2 at least.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.3, help="The allowed relative regression.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write the results to the JSON file.")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    settings.configure(INSTALLED_APPS=["django_translate_gettext"])
+    django.setup()
+    if args.case is not None:
+        case = json.loads(args.case)
+        print(json.dumps(run_case(**case | {"template": Path(case["template"])})))
+        return
+
+    results = []
+    print(f"{'mode':<7} {'files':>6} {'files/s':>9} {'peak MB':>8} {'parse':>8} {'visit':>8} {'unparse':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as template:
+            generate_apps(Path(template), size=size)
+            for mode in args.modes:
+                runner = run_isolated_case if mode == "pooled" else run_case
+                result = runner(mode=mode, template=Path(template), size=size, jobs=args.jobs)
+                results.append(result)
+                timings = result["timings"]
+                print(
+                    f"{mode:<7} {size:>6} {result['files_per_second']:>9} {result['peak_memory_mb']:>8} "
+                    f"{timings['parse']:>8.3f} {timings['visit']:>8.3f} {timings['unparse']:>8.3f}"
+                )
+
+    if args.json_path is not None:
+        args.json_path.write_text(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = {f"{result['mode']}-{result['size']}": result for result in results}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Stored the baseline to {args.baseline}.")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --update-baseline to store it.")
+        return
+
+    regressions = compare_baseline(results, json.loads(args.baseline.read_text()), tolerance=args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark the po file translation pipeline against the mock translator backend.
+
+Measures the translated entries per second and the backend requests per entry for the thread pool
+and the asyncio pipelines at several catalog sizes.
+
+Usage:
+    python benchmarks/bench_translators.py --sizes 100 1000 5000 --latency 0.01 --json results.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+MODES = ("threads", "async")
+
+
+def write_catalog(po_file: Path, *, size: int) -> None:
+    po_file.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['msgid ""', 'msgstr ""', '"Content-Type: text/plain; charset=UTF-8\\n"', ""]
+    for number in range(size):
+        lines.append(f"#: app/models.py:{number + 1}")
+        if number % 10 == 0:
+            lines.extend([
+                f'msgid "{number} item of the catalog"',
+                f'msgid_plural "{number} items of the catalog"',
+                'msgstr[0] ""',
+                'msgstr[1] ""',
+            ])
+        else:
+            lines.extend([f'msgid "Field number {number} of the model"', 'msgstr ""'])
+        lines.append("")
+    po_file.write_text("\n".join(lines), encoding="utf-8")
+
+
+def run_case(*, mode: str, size: int, chunk_size: int, workers: int) -> dict:
+    from django_translate_gettext.services.pipeline import AsyncTranslationPipeline
+    from django_translate_gettext.services.translators import PoFileTranslator
+
+    with tempfile.TemporaryDirectory() as locale_path, tempfile.TemporaryDirectory() as state_path:
+        settings.LOCALE_PATHS = [locale_path]
+        settings.TRANSLATE_GETTEXT_JOURNAL_PATH = str(Path(state_path, "journal"))
+        settings.TRANSLATE_GETTEXT_MEMORY_PATH = str(Path(state_path, "memory"))
+        settings.TRANSLATE_GETTEXT_CACHE_PATH = str(Path(state_path, "cache"))
+        write_catalog(Path(locale_path, "de", "LC_MESSAGES", "django.po"), size=size)
+        translator = PoFileTranslator("de", chunk_size=chunk_size, workers=workers, backend="mock")
+        entries = len(translator.fetch_msgids(translator.get_po_file(locale_path=Path(locale_path))))
+
+        started_at = time.perf_counter()
+        if mode == "async":
+            errors = [error for error in AsyncTranslationPipeline([translator]).run().values() if error]
+            if errors:
+                raise errors[0]
+        else:
+            translator.translate_codes()
+        elapsed = time.perf_counter() - started_at
+
+    return {
+        "mode": mode,
+        "size": size,
+        "entries": entries,
+        "seconds": round(elapsed, 4),
+        "entries_per_second": round(entries / elapsed, 1),
+        "requests": translator.translator.requests,
+        "requests_per_entry": round(translator.translator.requests / max(entries, 1), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 5000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--latency", type=float, default=0.01, help="The mock backend request latency, seconds.")
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--json", dest="json_path", type=Path, help="Write the results to the JSON file.")
+    args = parser.parse_args()
+
+    settings.configure(
+        LOCALE_PATHS=[],
+        TRANSLATE_GETTEXT_BACKEND_OPTIONS={"mock": {"latency": args.latency}},
+    )
+    django.setup()
+
+    results = []
+    print(f"{'mode':<8} {'size':>7} {'entries/s':>12} {'requests/entry':>15} {'seconds':>9}")
+    for size in args.sizes:
+        for mode in args.modes:
+            result = run_case(mode=mode, size=size, chunk_size=args.chunk_size, workers=args.workers)
+            results.append(result)
+            print(
+                f"{mode:<8} {size:>7} {result['entries_per_second']:>12} "
+                f"{result['requests_per_entry']:>15} {result['seconds']:>9}"
+            )
+
+    if args.json_path is not None:
+        args.json_path.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
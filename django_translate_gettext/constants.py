@@ -1 +1,62 @@
-TO_SKIP = ("__init__", "apps.py", "migrations", "tests", "urls.py", "views", "settings")
+TO_SKIP = (
+    "__init__.py",
+    "apps.py",
+    "settings.py",
+    "tests.py",
+    "urls.py",
+    "views.py",
+    "migrations/",
+    "settings/",
+    "tests/",
+    "views/",
+)
+DISCOVERY_INCLUDE = ("*.py",)
+PRUNE_DIRS = (
+    ".*/",
+    "__pycache__/",
+    "node_modules/",
+    "venv/",
+    "static/",
+    "staticfiles/",
+    "templates/",
+    "build/",
+    "dist/",
+    "*.egg-info/",
+)
+PYPROJECT_SECTION = "django-translate-gettext"
+
+BATCH_CHUNK_SIZE = 50
+BATCH_MAX_CHARS = 4500
+BATCH_WORKERS = 4
+BATCH_RETRIES = 3
+BATCH_BACKOFF = 1.0
+BATCH_DELIMITER = "\n"
+
+MEMORY_PATH = ".translate_gettext_memory.sqlite3"
+MEMORY_MAX_SIZE = 100_000
+MEMORY_QUERY_SIZE = 500
+
+BACKEND_NAME = "google"
+SOURCE_LANG = "auto"
+BACKEND_LIMITS = {
+    "google": {"concurrency": 8, "rate": 5.0, "burst": 10},
+    "local": {"concurrency": 32, "rate": 10_000.0, "burst": 10_000},
+    "mock": {"concurrency": 32, "rate": 10_000.0, "burst": 10_000},
+}
+RATE_LIMIT_BACKOFF = 5.0
+
+SCAN_MARKERS = (b"Model", b"TextChoices")
+SCAN_NAME_BASE_PATTERN = rb"class\s+\w+\s*\(\s*(?:#[^\n]*\s*)*\w+\s*[,)]"
+
+CACHE_PATH = ".translate_gettext_cache"
+PACKAGE_NAME = "django-translate-gettext"
+
+JOBS_BATCHES_PER_WORKER = 4
+
+FORMAT_MAX_ARGS_LENGTH = 30_000
+
+PROGRESS_INTERVAL = 10.0
+
+JOURNAL_PATH = ".translate_gettext_journal"
+CHECKPOINT_EVERY = 200
+CHECKPOINT_INTERVAL = 30.0
@@ -2,3 +2,7 @@ class TranslatorError(Exception):
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
+
+
+class PoFileError(TranslatorError):
+    pass
@@ -1,15 +1,37 @@
 import concurrent.futures
+import functools
+import json
+import math
+import os
 import subprocess
-from contextlib import suppress
+from contextlib import nullcontext, suppress
 from pathlib import Path
 from typing import NamedTuple
 
 from django.apps import apps
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
-from django_translate_gettext.exceptions import TranslatorError
-from django_translate_gettext.services import update_py_file
-from django_translate_gettext.services.files import fetch_app_files
+from django_translate_gettext.constants import (
+    BATCH_CHUNK_SIZE,
+    BATCH_WORKERS,
+    CHECKPOINT_EVERY,
+    CHECKPOINT_INTERVAL,
+    JOBS_BATCHES_PER_WORKER,
+    PROGRESS_INTERVAL,
+)
+from django_translate_gettext.exceptions import PoFileError, TranslatorError
+from django_translate_gettext.services.extractors import Message, collect_catalog_messages
+from django_translate_gettext.services.files import FileResult, fetch_apps_files, update_py_files
+from django_translate_gettext.services.formatters import format_py_files
+from django_translate_gettext.services.manifest import Manifest
+from django_translate_gettext.services.memory import TranslationMemory
+from django_translate_gettext.services.mo import compile_po_file
+from django_translate_gettext.services.models import get_app_model_files
+from django_translate_gettext.services.pipeline import AsyncTranslationPipeline
+from django_translate_gettext.services.po import merge_po_file
+from django_translate_gettext.services.progress import METRICS_FORMATS, ProgressReporter, ProgressTracker
+from django_translate_gettext.services.reports import RunReport
 from django_translate_gettext.services.translators import PoFileTranslator
 
 MAX_WORKERS = 5
@@ -33,6 +55,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Call Ruff formatting tool to format the code after generating new model files.",
         )
+        parser.add_argument(
+            "--models-only",
+            action="store_true",
+            help="Add gettext only for the files defining the app models instead of all app python files.",
+        )
         parser.add_argument(
             "-mm",
             "--makemessages",
@@ -42,17 +69,139 @@ class Command(BaseCommand):
             "and translating for the passed languages."
             "\nFor example: en de fr",
         )
+        parser.add_argument(
+            "--compile",
+            action="store_true",
+            help="Compile the .mo files for the passed languages after translating, the .po files unchanged "
+            "since the last compilation are skipped.",
+        )
+        parser.add_argument(
+            "--extract",
+            action="store_true",
+            help="Extract the gettext messages from the app files in process and merge them to the .po files "
+            "instead of calling the makemessages command.",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="The number of the processes to add gettext for the files, the CPU count by default.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=BATCH_CHUNK_SIZE,
+            help="The number of the msgids sent to the translator in the single request.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=BATCH_WORKERS,
+            help="The number of the concurrent translator requests for the every lang code.",
+        )
+        parser.add_argument(
+            "--backend",
+            type=str,
+            help="The translator backend name (google, local, mock) or the dotted path to the backend class, "
+            "the TRANSLATE_GETTEXT_BACKEND setting by default.",
+        )
+        parser.add_argument(
+            "--async",
+            dest="use_async",
+            action="store_true",
+            help="Translate all lang codes through the single asyncio scheduler sharing the backend rate limits.",
+        )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            help="Print the translation progress per lang code and stage periodically.",
+        )
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=PROGRESS_INTERVAL,
+            help="The seconds between the progress reports and the metrics writes.",
+        )
+        parser.add_argument(
+            "--metrics",
+            dest="metrics_path",
+            type=Path,
+            help="Write the translation metrics to the file periodically.",
+        )
+        parser.add_argument(
+            "--metrics-format",
+            choices=METRICS_FORMATS,
+            default="jsonl",
+            help="The metrics file format: appended JSON lines or the Prometheus textfile replaced on every write.",
+        )
+        parser.add_argument(
+            "--no-memory",
+            action="store_true",
+            help="Don't use the translation memory to look up and store the translated strings.",
+        )
+        parser.add_argument(
+            "-i",
+            "--incremental",
+            action="store_true",
+            help="Skip the files and the .po files that were not changed since the last run.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume the interrupted translation from the checkpoints, the files are not changed "
+            "and the makemessages command is not called.",
+        )
+        parser.add_argument(
+            "--checkpoint-every",
+            type=int,
+            default=CHECKPOINT_EVERY,
+            help="Sync the journal of the translated strings to the disk every N translated strings.",
+        )
+        parser.add_argument(
+            "--checkpoint-interval",
+            type=float,
+            default=CHECKPOINT_INTERVAL,
+            help="Write the translated strings to the .po files every N seconds.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Don't write the files and the .po files, only report what would change.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="The same as --dry-run, but exit with the error if any file would change or any string "
+            "is not translated.",
+        )
+        parser.add_argument(
+            "--report",
+            dest="report_path",
+            type=Path,
+            help="Write the JSON report to the file, the report is printed for --dry-run and --check by default.",
+        )
 
     def handle(self, **options) -> None:
-        files_to_gettext = []
-        for app_name in options["apps"]:
-            try:
-                apps.get_app_config(app_name)
-            except LookupError as error:
-                self.stdout.write(self.style.ERROR(error))
-                continue
+        app_names = self.fetch_app_names(app_names=options["apps"])
+        dry_run = options["dry_run"] or options["check"]
+        report = RunReport(mode="check" if options["check"] else "dry-run" if dry_run else "write")
+        manifest = Manifest() if options["incremental"] else None
+        with report.timer.stage("discovery"):
+            files_to_gettext = self.fetch_app_files_to_gettext(
+                app_names=app_names, formatted=options["format"], models_only=options["models_only"]
+            )
+            if manifest is not None:
+                files_to_gettext = [file for file in files_to_gettext if not manifest.is_unchanged(file.file_path)]
 
-            files_to_gettext.extend(self.fetch_app_files_to_gettext(app_name=app_name, formatted=options["format"]))
+        if dry_run:
+            self.check_files(files=files_to_gettext, report=report, **options)
+            return
+
+        if options["resume"]:
+            self.process_translating(report=report, **options)
+            self.write_report(report=report, file_path=options["report_path"], printed=False)
+            return
 
         self.stdout.write(
             self.style.WARNING(
@@ -61,17 +210,86 @@ class Command(BaseCommand):
             )
         )
 
-        self.add_gettext_for_files(files=files_to_gettext)
+        extract = options["extract"] and bool(options["makemessages"])
+        results = self.add_gettext_for_files(
+            files=files_to_gettext, jobs=options["jobs"], extract=extract, report=report
+        )
         self.stdout.write(self.style.SUCCESS("Successfully added gettext for the apps files."))
 
-        self.process_translating(**options)
+        self.process_translating(
+            manifest=manifest,
+            files_changed=bool(files_to_gettext),
+            report=report,
+            messages=[message for result in results for message in result.messages or ()] if extract else None,
+            **options,
+        )
+        if manifest is not None:
+            for result in results:
+                if result.error is None:
+                    manifest.update(result.file_path)
+            manifest.save()
+
+        self.write_report(report=report, file_path=options["report_path"], printed=False)
+
+    def fetch_app_names(self, *, app_names: list[str]) -> list[str]:
+        result = []
+        for app_name in app_names:
+            try:
+                apps.get_app_config(app_name)
+            except LookupError as error:
+                self.stdout.write(self.style.ERROR(error))
+                continue
+
+            result.append(app_name)
+        return result
+
+    def check_files(self, *, files: list[FileToGettext], report: RunReport, **options) -> None:
+        self.add_gettext_for_files(files=files, jobs=options["jobs"], dry_run=True, report=report)
+        self.collect_pending(lang_codes=options["makemessages"] or [], report=report)
+        self.write_report(report=report, file_path=options["report_path"], printed=True)
+        if options["check"] and report.has_changes:
+            error_message = "Some files would change or some strings are not translated."
+            raise CommandError(error_message)
 
-    def translate_lang_code(self, lang_code: str) -> None:
-        translator = PoFileTranslator(lang_code=lang_code)
+    def write_report(self, *, report: RunReport, file_path: Path | None, printed: bool) -> None:
+        content = json.dumps(report.to_dict(), indent=2, ensure_ascii=False)
+        if file_path is not None:
+            file_path.write_text(content)
+        elif printed:
+            self.stdout.write(content)
+
+    @staticmethod
+    def collect_pending(*, lang_codes: list[str], report: RunReport) -> None:
+        with report.timer.stage("translate"):
+            for lang_code in lang_codes:
+                for locale_path in settings.LOCALE_PATHS:
+                    po_file = Path(locale_path, lang_code, "LC_MESSAGES", "django.po")
+                    msgids = PoFileTranslator.fetch_msgids(po_file) if po_file.exists() else []
+                    report.add_pending(lang_code, msgids)
+
+    def translate_lang_code(self, lang_code: str, **translator_options) -> None:
+        translator = PoFileTranslator(lang_code=lang_code, **translator_options)
         translator.translate_codes()
         self.stdout.write(self.style.SUCCESS(f"Successfully translated for lang code {lang_code}."))
 
-    def process_translating(self, **options) -> None:
+    @staticmethod
+    def has_catalogs(lang_codes: list[str]) -> bool:
+        return all(
+            Path(locale_path, lang_code, "LC_MESSAGES", "django.po").exists()
+            for locale_path in settings.LOCALE_PATHS
+            for lang_code in lang_codes
+        )
+
+    def process_translating(
+        self,
+        *,
+        manifest: Manifest | None = None,
+        files_changed: bool = True,
+        report: RunReport | None = None,
+        messages: list[Message] | None = None,
+        **options,
+    ) -> None:
+        report = report or RunReport(mode="write")
         if not options["makemessages"]:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -80,41 +298,183 @@ class Command(BaseCommand):
             )
             return
 
-        self.stdout.write(self.style.WARNING("Calling makemessages command to create the .po files."))
-        langs = [f"--locale={lang}" for lang in options["makemessages"]]
-        with suppress(subprocess.CalledProcessError):
-            subprocess.run(["python", "manage.py", "makemessages", *langs], check=True)  # noqa: S603, S607
+        lang_codes = list(dict.fromkeys(options["makemessages"]))
+        if options["resume"]:
+            self.stdout.write(self.style.WARNING("Resuming the translation, skipping makemessages command."))
+        elif manifest is not None and not files_changed and self.has_catalogs(lang_codes):
+            self.stdout.write(self.style.WARNING("No files changed, skipping makemessages command."))
+        elif messages is not None:
+            with report.timer.stage("makemessages"):
+                self.merge_messages(lang_codes=lang_codes, messages=messages)
+        else:
+            self.stdout.write(self.style.WARNING("Calling makemessages command to create the .po files."))
+            langs = [f"--locale={lang}" for lang in lang_codes]
+            with report.timer.stage("makemessages"), suppress(subprocess.CalledProcessError):
+                subprocess.run(["python", "manage.py", "makemessages", *langs], check=True)  # noqa: S603, S607
+
+        memory = None if options["no_memory"] else TranslationMemory()
+        translator_options = {
+            "chunk_size": options["chunk_size"],
+            "workers": options["concurrency"],
+            "memory": memory,
+            "manifest": manifest,
+            "backend": options["backend"],
+            "progress": ProgressTracker(),
+            "resume": options["resume"],
+            "checkpoint_every": options["checkpoint_every"],
+            "checkpoint_interval": options["checkpoint_interval"],
+        }
+        with report.timer.stage("translate"), self.report_progress(translator_options["progress"], **options):
+            if options["use_async"]:
+                self.translate_lang_codes_async(lang_codes=lang_codes, **translator_options)
+            else:
+                self.translate_lang_codes(lang_codes=lang_codes, **translator_options)
+
+        if memory is not None:
+            memory.close()
+
+        if options["compile"]:
+            with report.timer.stage("compile"):
+                self.compile_catalogs(lang_codes=lang_codes, manifest=manifest, jobs=options["jobs"])
+
+    def compile_catalogs(self, *, lang_codes: list[str], manifest: Manifest | None, jobs: int) -> None:
+        manifest = manifest or Manifest()
+        po_files = [
+            po_file
+            for locale_path in settings.LOCALE_PATHS
+            for lang_code in lang_codes
+            if (po_file := Path(locale_path, lang_code, "LC_MESSAGES", "django.po")).exists()
+            and not (po_file.with_suffix(".mo").exists() and manifest.is_unchanged(po_file, kind="compiled"))
+        ]
+        if not po_files:
+            self.stdout.write("All .mo files are up to date.")
+            return
+
+        max_workers = min(jobs, len(po_files))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(compile_po_file, po_file): po_file for po_file in po_files}
+            for future in concurrent.futures.as_completed(futures):
+                po_file = futures[future]
+                try:
+                    future.result()
+                except (OSError, PoFileError) as error:
+                    self.stdout.write(self.style.ERROR(f"Failed to compile {po_file}: {error}"))
+                    continue
+                manifest.update(po_file, kind="compiled")
+
+        manifest.save()
+        self.stdout.write(self.style.SUCCESS(f"Compiled {len(po_files)} .mo files."))
+
+    def merge_messages(self, *, lang_codes: list[str], messages: list[Message]) -> None:
+        catalog_messages = collect_catalog_messages(messages)
+        locale_path = settings.LOCALE_PATHS[0] if settings.LOCALE_PATHS else "locale"
+        for lang_code in lang_codes:
+            po_file = Path(locale_path, lang_code, "LC_MESSAGES", "django.po")
+            try:
+                added = merge_po_file(po_file, catalog_messages, lang_code=lang_code)
+            except PoFileError as error:
+                self.stdout.write(self.style.ERROR(f"Translator error: {error}"))
+                continue
+
+            self.stdout.write(f"Extracted {len(catalog_messages)} messages to {po_file}, {added} new.")
 
-        lang_codes = options["makemessages"]
+    def report_progress(self, tracker: ProgressTracker, **options) -> ProgressReporter | nullcontext:
+        if not options["progress"] and options["metrics_path"] is None:
+            return nullcontext()
+        return ProgressReporter(
+            tracker,
+            interval=options["progress_interval"],
+            output=self.stdout.write if options["progress"] else None,
+            metrics_path=options["metrics_path"],
+            metrics_format=options["metrics_format"],
+        )
+
+    def translate_lang_codes(self, *, lang_codes: list[str], **translator_options) -> None:
         max_workers = MAX_WORKERS if len(lang_codes) > MAX_WORKERS else len(lang_codes)
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(self.translate_lang_code, code) for code in lang_codes]
+            futures = [executor.submit(self.translate_lang_code, code, **translator_options) for code in lang_codes]
             for future in concurrent.futures.as_completed(futures):
                 try:
                     future.result()
                 except TranslatorError as error:  # noqa: PERF203
                     self.stdout.write(self.style.ERROR(f"Translator error: {error}"))
 
+    def translate_lang_codes_async(self, *, lang_codes: list[str], **translator_options) -> None:
+        translators = []
+        for lang_code in lang_codes:
+            try:
+                translators.append(PoFileTranslator(lang_code=lang_code, **translator_options))
+            except TranslatorError as error:  # noqa: PERF203
+                self.stdout.write(self.style.ERROR(f"Translator error: {error}"))
+
+        for lang_code, error in AsyncTranslationPipeline(translators).run().items():
+            if error is None:
+                self.stdout.write(self.style.SUCCESS(f"Successfully translated for lang code {lang_code}."))
+            elif isinstance(error, TranslatorError):
+                self.stdout.write(self.style.ERROR(f"Translator error: {error}"))
+            else:
+                raise error
+
     @staticmethod
-    def fetch_app_files_to_gettext(*, app_name: str, formatted: bool = False) -> list[FileToGettext]:
-        return [
-            FileToGettext(file_path=file_path, formatted=formatted) for file_path in fetch_app_files(app_name=app_name)
-        ]
+    def fetch_app_files_to_gettext(
+        *, app_names: list[str], formatted: bool = False, models_only: bool = False
+    ) -> list[FileToGettext]:
+        if models_only:
+            file_paths = {file_path for app_name in app_names for file_path in get_app_model_files(app_name)}
+        else:
+            file_paths = fetch_apps_files(app_names=app_names)
+        return [FileToGettext(file_path=file_path, formatted=formatted) for file_path in sorted(file_paths)]
 
     @staticmethod
-    def gettext_py_file(file_path: Path, formatted: bool = False) -> None:  # noqa: FBT001, FBT002
-        with suppress(FileNotFoundError):
-            update_py_file(file_path=file_path)
-            filename = file_path.absolute()
-            if formatted:
-                subprocess.run(["ruff", "format", f"{filename!s}"], check=True)  # noqa: S603, S607
-
-    def add_gettext_for_files(self, files: list[FileToGettext]) -> None:
-        max_workers = MAX_WORKERS if len(files) > MAX_WORKERS else len(files)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(self.gettext_py_file, f.file_path, f.formatted) for f in files]
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    future.result()
-                except FileNotFoundError as error:  # noqa: PERF203
-                    self.stdout.write(self.style.ERROR(f"File not found error: {error}"))
+    def update_py_files(
+        *, file_paths: list[Path], jobs: int, dry_run: bool = False, extract: bool = False
+    ) -> list[FileResult]:
+        if jobs <= 1 or len(file_paths) <= 1:
+            return update_py_files(file_paths, dry_run=dry_run, extract=extract)
+
+        batch_size = math.ceil(len(file_paths) / (jobs * JOBS_BATCHES_PER_WORKER))
+        batches = [file_paths[start : start + batch_size] for start in range(0, len(file_paths), batch_size)]
+        update = functools.partial(update_py_files, dry_run=dry_run, extract=extract)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as executor:
+            return [result for results in executor.map(update, batches) for result in results]
+
+    def format_py_files(self, *, file_paths: list[Path]) -> None:
+        if not file_paths:
+            return
+
+        errors = format_py_files(file_paths)
+        for file_path, error in errors.items():
+            self.stdout.write(self.style.ERROR(f"Failed to format {file_path}: {error}"))
+
+    def add_gettext_for_files(  # noqa: PLR0913
+        self,
+        files: list[FileToGettext],
+        jobs: int = 1,
+        *,
+        dry_run: bool = False,
+        extract: bool = False,
+        report: RunReport | None = None,
+    ) -> list[FileResult]:
+        if not files:
+            return []
+
+        report = report or RunReport(mode="write")
+        results = self.update_py_files(
+            file_paths=[file.file_path for file in files], jobs=jobs, dry_run=dry_run, extract=extract
+        )
+        report.add_file_results(results)
+        for result in results:
+            if result.error is not None:
+                self.stdout.write(self.style.ERROR(f"Failed to add gettext for {result.file_path}: {result.error}"))
+
+        changed = [result for result in results if result.changed]
+        if dry_run:
+            return results
+
+        formatted = {file.file_path for file in files if file.formatted}
+        with report.timer.stage("format"):
+            self.format_py_files(file_paths=[result.file_path for result in changed if result.file_path in formatted])
+        self.stdout.write(
+            f"Wrapped {sum(result.wraps for result in changed)} strings in {len(changed)} of {len(results)} files."
+        )
+        return results
@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_translate_gettext.services.memory import MemoryEntry, TranslationMemory
+
+
+class Command(BaseCommand):
+    help = "Import, export or clear the translation memory used by the translate command"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("action", choices=("import", "export", "clear"), help="The action to run.")
+        parser.add_argument(
+            "file", nargs="?", type=Path, help="The JSON lines file to import the entries from or export them to."
+        )
+
+    def handle(self, **options) -> None:
+        memory = TranslationMemory()
+        try:
+            match options["action"]:
+                case "import":
+                    count = memory.import_entries(self.read_entries(file_path=self.get_file_path(**options)))
+                    self.stdout.write(self.style.SUCCESS(f"Successfully imported {count} translation memory entries."))
+                case "export":
+                    count = self.write_entries(file_path=self.get_file_path(**options), memory=memory)
+                    self.stdout.write(self.style.SUCCESS(f"Successfully exported {count} translation memory entries."))
+                case "clear":
+                    memory.clear()
+                    self.stdout.write(self.style.SUCCESS("Successfully cleared the translation memory."))
+        finally:
+            memory.close()
+
+    @staticmethod
+    def get_file_path(**options) -> Path:
+        if options["file"] is None:
+            raise CommandError(f"The file is required for the {options['action']} action.")
+        return options["file"]
+
+    @staticmethod
+    def read_entries(*, file_path: Path) -> list[MemoryEntry]:
+        if not file_path.exists():
+            raise CommandError(f"The file {file_path} does not exist.")
+
+        try:
+            return [MemoryEntry(**json.loads(line)) for line in file_path.read_text().splitlines() if line.strip()]
+        except (json.JSONDecodeError, TypeError) as error:
+            raise CommandError(f"The file {file_path} is not a valid translation memory export: {error}") from error
+
+    @staticmethod
+    def write_entries(*, file_path: Path, memory: TranslationMemory) -> int:
+        count = 0
+        with file_path.open("w") as file:
+            for entry in memory.export_entries():
+                file.write(json.dumps(entry._asdict(), ensure_ascii=False) + "\n")
+                count += 1
+        return count
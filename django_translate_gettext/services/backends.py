@@ -0,0 +1,150 @@
+import abc
+import json
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from deep_translator import GoogleTranslator
+from deep_translator.exceptions import LanguageNotSupportedException
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from django_translate_gettext.constants import BACKEND_NAME, BATCH_DELIMITER, SOURCE_LANG
+from django_translate_gettext.exceptions import TranslatorError
+
+BACKENDS: dict[str, type["TranslatorBackend"]] = {}
+
+
+def register_backend(name: str) -> Callable[[type["TranslatorBackend"]], type["TranslatorBackend"]]:
+    """Register the translator backend class under the name to select it with the TRANSLATE_GETTEXT_BACKEND setting.
+
+    Args:
+        name (str): The backend name.
+
+    Returns:
+        Callable: The class decorator.
+    """
+
+    def decorator(backend_class: type["TranslatorBackend"]) -> type["TranslatorBackend"]:
+        backend_class.name = name
+        BACKENDS[name] = backend_class
+        return backend_class
+
+    return decorator
+
+
+class TranslatorBackend(abc.ABC):
+    """The translator backend translating the texts from the source language to the target one.
+
+    The text may be the several msgids joined with the newline, the backend must keep the lines.
+    The failed requests should raise the deep_translator exceptions to be retried.
+    """
+
+    name = ""
+
+    def __init__(self, *, source: str, target: str, **options):
+        self.source = source
+        self.target = target
+        self.options = options
+
+    @abc.abstractmethod
+    def translate(self, text: str) -> str:
+        """Translate the text.
+
+        Args:
+            text (str): The text to translate.
+
+        Returns:
+            str: The translated text.
+        """
+
+
+@register_backend("google")
+class GoogleBackend(TranslatorBackend):
+    """The Google Translate backend, the source language is detected automatically for the "auto" source."""
+
+    def __init__(self, *, source: str, target: str, **options):
+        super().__init__(source=source, target=target, **options)
+        try:
+            self.translator = GoogleTranslator(source=source, target=target, **options)
+        except LanguageNotSupportedException as error:
+            raise TranslatorError(f"Language code {target} is not supported by the translator") from error
+
+    def translate(self, text: str) -> str:
+        return self.translator.translate(text) or ""
+
+
+@register_backend("local")
+class LocalBackend(TranslatorBackend):
+    """The offline backend looking up the translations in the dictionary, nothing is sent over the network.
+
+    The translations are passed with the "translations" option or loaded from the JSON file passed with the "path"
+    option, both are mappings of the target language codes to the mappings of the source texts to the translations.
+    The unknown texts are translated to the empty strings and stay untranslated in the po files.
+    """
+
+    def __init__(self, *, source: str, target: str, **options):
+        super().__init__(source=source, target=target, **options)
+        translations = options.get("translations")
+        if translations is None and options.get("path"):
+            try:
+                translations = json.loads(Path(options["path"]).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as error:
+                raise TranslatorError(f"Failed to load the translations from {options['path']}: {error}") from error
+        self.translations: dict[str, str] = (translations or {}).get(target, {})
+
+    def translate(self, text: str) -> str:
+        if text in self.translations:
+            return self.translations[text]
+        return BATCH_DELIMITER.join(self.translations.get(line, "") for line in text.split(BATCH_DELIMITER))
+
+
+@register_backend("mock")
+class MockBackend(TranslatorBackend):
+    """The deterministic backend for the benchmarks and the local runs, prefixing every line with the target code.
+
+    The "latency" option sets the seconds every request takes, the number of the requests is counted.
+    """
+
+    def __init__(self, *, source: str, target: str, **options):
+        super().__init__(source=source, target=target, **options)
+        self.latency = float(options.get("latency", 0.0))
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def translate(self, text: str) -> str:
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return BATCH_DELIMITER.join(f"[{self.target}] {line}" for line in text.split(BATCH_DELIMITER))
+
+
+def get_backend_name(name: str | None = None) -> str:
+    return name or getattr(settings, "TRANSLATE_GETTEXT_BACKEND", BACKEND_NAME)
+
+
+def get_backend(name: str | None = None, *, target: str, source: str | None = None) -> TranslatorBackend:
+    """Build the translator backend selected by the name or the TRANSLATE_GETTEXT_BACKEND setting.
+
+    The name is the registered backend name or the dotted path to the TranslatorBackend subclass,
+    the backend options are taken from the TRANSLATE_GETTEXT_BACKEND_OPTIONS setting by the name.
+
+    Args:
+        name (str | None): The backend name, the setting is used if not passed.
+        target (str): The target language code.
+        source (str | None): The source language code, the TRANSLATE_GETTEXT_SOURCE_LANGUAGE setting by default.
+
+    Returns:
+        TranslatorBackend: The backend instance.
+    """
+    name = get_backend_name(name)
+    try:
+        backend_class = BACKENDS[name] if name in BACKENDS else import_string(name)
+    except ImportError as error:
+        raise TranslatorError(f"Unknown translator backend {name}") from error
+
+    options = getattr(settings, "TRANSLATE_GETTEXT_BACKEND_OPTIONS", {}).get(name, {})
+    source = source or getattr(settings, "TRANSLATE_GETTEXT_SOURCE_LANGUAGE", SOURCE_LANG)
+    return backend_class(source=source, target=target, **options)
@@ -0,0 +1,129 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from django_translate_gettext.constants import CHECKPOINT_EVERY, CHECKPOINT_INTERVAL
+
+JOURNAL_DIR_LOCK = threading.Lock()
+
+
+class TranslationJournal:
+    """The append-only journal of the translated msgids of the lang code, kept until the lang code is done.
+
+    Every translated chunk is appended at once, so the resumed run requests nothing that was translated before.
+    """
+
+    def __init__(self, path: Path, *, resume: bool = False):
+        self.path = path
+        self.entries = self.load() if resume else {}
+        with JOURNAL_DIR_LOCK:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = self.path.open("a" if resume else "w", encoding="utf-8")
+
+    def load(self) -> dict[str, str]:
+        """Load the journal entries skipping the line cut off by the crash.
+
+        Returns:
+            dict[str, str]: The mapping of the msgids to the translated strings.
+        """
+        entries = {}
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return entries
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            entries[entry["source"]] = entry["translated"]
+        return entries
+
+    def append(self, translations: dict[str, str]) -> None:
+        self.file.writelines(
+            json.dumps({"source": source, "translated": translated}, ensure_ascii=False) + "\n"
+            for source, translated in translations.items()
+            if translated
+        )
+        self.file.flush()
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self, *, remove: bool = False) -> None:
+        """Close the journal, the removed journal takes its directory with it once no other journal is left.
+
+        Args:
+            remove (bool): Whether to remove the journal of the finished lang code.
+
+        Returns:
+            None
+        """
+        self.file.close()
+        if not remove:
+            return
+        with JOURNAL_DIR_LOCK:
+            self.path.unlink(missing_ok=True)
+            with contextlib.suppress(OSError):
+                self.path.parent.rmdir()
+
+
+class Checkpoint:
+    """Collect the translated chunks to the journal and write them to the catalogs every T seconds.
+
+    The journal is synced every N entries, so the crashed run loses at most N entries and the --resume run
+    reads the rest from the journal. The flush passes the translations since the previous flush to the callback,
+    which rewrites the whole catalogs with the atomic replace, so it is done on the time interval only.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[dict[str, str]], None],
+        *,
+        journal: TranslationJournal,
+        every: int = CHECKPOINT_EVERY,
+        interval: float = CHECKPOINT_INTERVAL,
+    ):
+        self.callback = callback
+        self.journal = journal
+        self.every = max(every, 1)
+        self.interval = interval
+        self.pending: dict[str, str] = {}
+        self.unsynced = 0
+        self.flushed_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+
+    def add(self, translations: dict[str, str]) -> bool:
+        """Journal the translations and check whether the checkpoint is due.
+
+        Args:
+            translations (dict[str, str]): The translated chunk.
+
+        Returns:
+            bool: True if the pending translations should be flushed to the catalogs.
+        """
+        with self.lock:
+            self.journal.append(translations)
+            self.pending.update(translations)
+            self.unsynced += len(translations)
+            if self.unsynced >= self.every:
+                self.journal.sync()
+                self.unsynced = 0
+            return bool(self.pending) and time.monotonic() - self.flushed_at >= self.interval
+
+    def flush(self) -> None:
+        with self.flush_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+                self.flushed_at = time.monotonic()
+                self.journal.sync()
+                self.unsynced = 0
+            if pending:
+                self.callback(pending)
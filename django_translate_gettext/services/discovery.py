@@ -0,0 +1,167 @@
+import fnmatch
+import os
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import tomllib
+from django.conf import settings
+
+from django_translate_gettext.constants import DISCOVERY_INCLUDE, PRUNE_DIRS, PYPROJECT_SECTION, TO_SKIP
+
+
+class PathMatcher:
+    """The glob patterns compiled to the single regular expression per kind, matched relative to the base directory.
+
+    The patterns without the slash match the file or directory name at any depth, the patterns with the slash match
+    the path relative to the base directory, the patterns ending with the slash match the directories only.
+    The negated gitignore patterns are not supported and skipped.
+    """
+
+    def __init__(self, patterns: Iterable[str], *, base: Path | None = None):
+        self.base = base
+        names, paths, dir_names, dir_paths = [], [], [], []
+        for raw_pattern in patterns:
+            pattern = raw_pattern.strip()
+            if not pattern or pattern.startswith(("#", "!")):
+                continue
+
+            dir_only = pattern.endswith("/")
+            pattern = pattern.strip("/")
+            anchored = "/" in pattern or raw_pattern.strip().startswith("/")
+            target = (dir_paths if anchored else dir_names) if dir_only else (paths if anchored else names)
+            target.append(fnmatch.translate(pattern))
+
+        self.names = self.compile(names)
+        self.paths = self.compile(paths)
+        self.dir_names = self.compile(dir_names)
+        self.dir_paths = self.compile(dir_paths)
+
+    @staticmethod
+    def compile(patterns: list[str]) -> re.Pattern | None:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns)) if patterns else None
+
+    @classmethod
+    def from_gitignore(cls, path: Path) -> "PathMatcher | None":
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return cls(lines, base=path.parent)
+
+    def relative(self, path: str) -> str | None:
+        if self.base is None:
+            return path.replace(os.sep, "/")
+        base = str(self.base)
+        if base in {"", "."}:
+            return path.replace(os.sep, "/")
+        if not path.startswith(base + os.sep):
+            return None
+        return path[len(base) + 1 :].replace(os.sep, "/")
+
+    def matches(self, path: str, name: str, *, is_dir: bool) -> bool:
+        """Check whether the path matches any pattern.
+
+        Args:
+            path (str): The path as it was walked.
+            name (str): The file or directory name.
+            is_dir (bool): Whether the path is the directory.
+
+        Returns:
+            bool: True if the path matches.
+        """
+        names = (self.names, self.dir_names) if is_dir else (self.names,)
+        if any(pattern is not None and pattern.match(name) for pattern in names):
+            return True
+
+        paths = (self.paths, self.dir_paths) if is_dir else (self.paths,)
+        if all(pattern is None for pattern in paths):
+            return False
+        relative = self.relative(path)
+        return relative is not None and any(pattern is not None and pattern.match(relative) for pattern in paths)
+
+
+def load_pyproject_config(path: Path = Path("pyproject.toml")) -> dict:
+    try:
+        with path.open("rb") as file:
+            return tomllib.load(file).get("tool", {}).get(PYPROJECT_SECTION, {})
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+
+
+def get_discovery_patterns() -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Get the include and exclude glob patterns.
+
+    The TRANSLATE_GETTEXT_INCLUDE and TRANSLATE_GETTEXT_EXCLUDE settings take precedence over the include
+    and exclude keys of the [tool.django-translate-gettext] pyproject.toml section, the defaults are used otherwise.
+    The TRANSLATE_GETTEXT_EXTEND_EXCLUDE setting or the extend-exclude key add the patterns to the exclude ones.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[str, ...]]: The include and exclude patterns.
+    """
+    config = load_pyproject_config()
+    include = getattr(settings, "TRANSLATE_GETTEXT_INCLUDE", None) or config.get("include") or DISCOVERY_INCLUDE
+    exclude = getattr(settings, "TRANSLATE_GETTEXT_EXCLUDE", None) or config.get("exclude") or TO_SKIP
+    extend_exclude = getattr(settings, "TRANSLATE_GETTEXT_EXTEND_EXCLUDE", None) or config.get("extend-exclude") or ()
+    return tuple(include), (*exclude, *extend_exclude)
+
+
+class FileDiscovery:
+    """Walk the directories with os.scandir pruning the excluded and ignored directories before entering them."""
+
+    def __init__(
+        self,
+        *,
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] | None = None,
+        gitignore: bool = True,
+    ):
+        if include is None or exclude is None:
+            default_include, default_exclude = get_discovery_patterns()
+            include = default_include if include is None else include
+            exclude = default_exclude if exclude is None else exclude
+
+        self.include = PathMatcher(include)
+        self.exclude = PathMatcher(exclude)
+        self.prune = PathMatcher(PRUNE_DIRS)
+        self.gitignore = gitignore
+        root_gitignore = PathMatcher.from_gitignore(Path(".gitignore")) if gitignore else None
+        self.root_ignores = [root_gitignore] if root_gitignore is not None else []
+
+    def is_excluded(self, path: str, name: str, *, is_dir: bool, ignores: list[PathMatcher]) -> bool:
+        if is_dir and self.prune.matches(path, name, is_dir=True):
+            return True
+        if self.exclude.matches(path, name, is_dir=is_dir):
+            return True
+        return any(ignore.matches(path, name, is_dir=is_dir) for ignore in ignores)
+
+    def walk(self, root: Path) -> Iterator[Path]:
+        """Yield the included files under the root directory.
+
+        Args:
+            root (Path): The directory to walk.
+
+        Returns:
+            Iterator[Path]: The file paths.
+        """
+        stack = [(str(root), self.root_ignores)]
+        while stack:
+            directory, ignores = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                continue
+
+            if self.gitignore and any(entry.name == ".gitignore" for entry in entries):
+                gitignore = PathMatcher.from_gitignore(Path(directory, ".gitignore"))
+                ignores = [*ignores, gitignore] if gitignore is not None else ignores
+
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if self.is_excluded(entry.path, entry.name, is_dir=is_dir, ignores=ignores):
+                    continue
+                if is_dir:
+                    stack.append((entry.path, ignores))
+                elif entry.is_file() and self.include.matches(entry.path, entry.name, is_dir=False):
+                    yield Path(entry.path)
@@ -0,0 +1,110 @@
+import ast
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+# The gettext function names mapped to the positions of the msgctxt, msgid and msgid_plural arguments.
+GETTEXT_FUNCTIONS = {
+    "_": (None, 0, None),
+    "gettext": (None, 0, None),
+    "gettext_lazy": (None, 0, None),
+    "gettext_noop": (None, 0, None),
+    "ngettext": (None, 0, 1),
+    "ngettext_lazy": (None, 0, 1),
+    "pgettext": (0, 1, None),
+    "pgettext_lazy": (0, 1, None),
+    "npgettext": (0, 1, 2),
+    "npgettext_lazy": (0, 1, 2),
+}
+
+
+class Message(NamedTuple):
+    msgctxt: str | None
+    msgid: str
+    msgid_plural: str | None
+    reference: str
+
+
+class MessageExtractor(ast.NodeVisitor):
+    """Collect the gettext calls with the constant string arguments like xgettext does for the python files."""
+
+    def __init__(self, *, file_path: Path, line_shift: tuple[int, int] | None = None):
+        self.reference = file_path.as_posix()
+        self.line_shift = line_shift
+        self.messages: list[Message] = []
+
+    def get_lineno(self, node: ast.Call) -> int:
+        lineno = getattr(node, "lineno", 0)
+        if self.line_shift is not None and lineno >= self.line_shift[0]:
+            return lineno + self.line_shift[1]
+        return lineno
+
+    @staticmethod
+    def get_argument(node: ast.Call, position: int | None) -> str | None:
+        if position is None or position >= len(node.args):
+            return None
+        argument = node.args[position]
+        if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+            return argument.value
+        return None
+
+    def visit_Call(self, node: ast.Call) -> None:  # noqa: N802
+        if isinstance(node.func, ast.Name) and node.func.id in GETTEXT_FUNCTIONS:
+            msgctxt_position, msgid_position, plural_position = GETTEXT_FUNCTIONS[node.func.id]
+            msgid = self.get_argument(node, msgid_position)
+            msgctxt = self.get_argument(node, msgctxt_position)
+            msgid_plural = self.get_argument(node, plural_position)
+            if (
+                msgid
+                and (msgctxt_position is None or msgctxt is not None)
+                and (plural_position is None or msgid_plural is not None)
+            ):
+                reference = f"{self.reference}:{self.get_lineno(node)}"
+                self.messages.append(Message(msgctxt, msgid, msgid_plural, reference))
+
+        self.generic_visit(node)
+
+
+def extract_messages(
+    tree: ast.AST, *, file_path: Path, line_shift: tuple[int, int] | None = None
+) -> tuple[Message, ...]:
+    """Extract the gettext messages from the parsed module.
+
+    Args:
+        tree (ast.AST): The parsed, possibly transformed module.
+        file_path (Path): The module file path used for the references.
+        line_shift (tuple[int, int] | None): The first line and the number of lines to shift the references by,
+            the lines after the inserted gettext import are shifted.
+
+    Returns:
+        tuple[Message, ...]: The extracted messages.
+    """
+    extractor = MessageExtractor(file_path=file_path, line_shift=line_shift)
+    extractor.visit(tree)
+    return tuple(extractor.messages)
+
+
+class CatalogMessage(NamedTuple):
+    msgctxt: str | None
+    msgid: str
+    msgid_plural: str | None
+    references: list[str]
+
+
+def collect_catalog_messages(messages: Iterable[Message]) -> dict[tuple[str | None, str], CatalogMessage]:
+    """Group the messages by the msgctxt and msgid keeping the order of their first appearance.
+
+    Args:
+        messages (Iterable[Message]): The extracted messages.
+
+    Returns:
+        dict[tuple[str | None, str], CatalogMessage]: The catalog messages by the msgctxt and msgid.
+    """
+    result = {}
+    for message in messages:
+        key = (message.msgctxt, message.msgid)
+        if key not in result:
+            result[key] = CatalogMessage(message.msgctxt, message.msgid, message.msgid_plural, [])
+        if message.reference not in result[key].references:
+            result[key].references.append(message.reference)
+    return result
@@ -1,40 +1,145 @@
 import ast
+import re
+import time
 from pathlib import Path
+from typing import NamedTuple
 
-from django_translate_gettext.constants import TO_SKIP
+from django_translate_gettext.constants import SCAN_MARKERS, SCAN_NAME_BASE_PATTERN
+from django_translate_gettext.services.discovery import FileDiscovery
+from django_translate_gettext.services.extractors import Message, extract_messages
+from django_translate_gettext.services.rewriters import find_import_position, rewrite_source
 from django_translate_gettext.services.transformers import ClassDefTransformer
 
+NAME_BASE_PATTERN = re.compile(SCAN_NAME_BASE_PATTERN)
 
-def fetch_app_files(app_name: str) -> set[Path]:
-    """Fetch all python files in the app directory excluding the files in the TO_SKIP list.
+
+class FileResult(NamedTuple):
+    file_path: Path
+    changed: bool = False
+    wraps: int = 0
+    error: str | None = None
+    wrap_types: dict[str, int] | None = None
+    timings: dict[str, float] | None = None
+    messages: tuple[Message, ...] | None = None
+
+
+def fetch_app_files(app_name: str, *, discovery: FileDiscovery | None = None) -> set[Path]:
+    """Fetch all python files in the app directory excluding the files matching the exclude patterns.
 
     Args:
         app_name (str): The app name to fetch the files from.
+        discovery (FileDiscovery | None): The configured file discovery, built from the settings if not passed.
 
     Returns:
         set[Path]: set of filtered Pathlib objects for the files in the app.
     """
-    return {
-        file
-        for file in Path(app_name).rglob("*.py")
-        if file.is_file() and not any(skip in str(file) for skip in TO_SKIP)
-    }
+    discovery = discovery or FileDiscovery()
+    return set(discovery.walk(Path(app_name)))
+
+
+def fetch_apps_files(app_names: list[str]) -> set[Path]:
+    """Fetch all python files for the apps walking every app directory once.
+
+    Args:
+        app_names (list[str]): The app names to fetch the files from.
+
+    Returns:
+        set[Path]: set of filtered Pathlib objects for the files in the apps.
+    """
+    roots = sorted({Path(app_name) for app_name in app_names}, key=lambda root: len(root.parts))
+    walked: list[Path] = []
+    for root in roots:
+        if not any(root.is_relative_to(parent) for parent in walked):
+            walked.append(root)
+    discovery = FileDiscovery()
+    return {file for root in walked for file in fetch_app_files(str(root), discovery=discovery)}
+
 
+def is_gettext_candidate(source: bytes) -> bool:
+    """Check cheaply whether the source may contain anything to wrap with the gettext call.
+
+    The transformer wraps the classes based on the plain name like CharField or Base in any module,
+    and the classes based on the ModelAdmin, TextChoices or Model attribute, so only the files
+    without such classes are skipped.
+
+    Args:
+        source (bytes): The python file source.
 
-def update_py_file(*, file_path: Path) -> None:
+    Returns:
+        bool: False if the file surely has nothing to wrap.
+    """
+    if b"class" not in source:
+        return False
+    return any(marker in source for marker in SCAN_MARKERS) or NAME_BASE_PATTERN.search(source) is not None
+
+
+def update_py_file(*, file_path: Path, dry_run: bool = False, extract: bool = False) -> FileResult:
     """Update the python file with the gettext call wrapping.
 
+    The file is read once, the files without the class definitions and the django markers are skipped
+    without parsing, the file is written only if anything was wrapped. The gettext calls and the import
+    are spliced into the original source, keeping the formatting and the comments untouched.
+
     Args:
         file_path (Path): The file path Pathlib object to update.
+        dry_run (bool): Don't write the file, only report whether it would change.
+        extract (bool): Extract the gettext messages from the transformed module.
 
     Returns:
-        None
+        FileResult: The result with the changed flag, the number of the wrapped strings and the stage timings.
     """
-    tree = ast.parse(file_path.read_text())
+    source = file_path.read_bytes()
+    candidate = is_gettext_candidate(source)
+    if not candidate and not (extract and b"gettext" in source):
+        return FileResult(file_path=file_path)
 
+    started_at = time.perf_counter()
+    tree = ast.parse(source, filename=str(file_path))
+    parsed_at = time.perf_counter()
     transformer = ClassDefTransformer()
-    new_tree = transformer.visit(tree)
-    new_tree = transformer.insert_getetxt_import(new_tree)
+    new_tree = transformer.visit(tree) if candidate else tree
+    transformed_at = time.perf_counter()
+    timings = {"parse": parsed_at - started_at, "transform": transformed_at - parsed_at}
+    if not transformer.wraps:
+        messages = extract_messages(tree, file_path=file_path) if extract else None
+        return FileResult(file_path=file_path, timings=timings, messages=messages)
+
+    line_shift = None
+    if transformer.spliceable:
+        code = rewrite_source(source, tree, transformer.edits)
+        import_position = find_import_position(tree)
+        line_shift = None if import_position is None else (import_position[0], 1)
+    else:
+        code = ast.unparse(transformer.insert_getetxt_import(new_tree)).encode()
+    timings["unparse"] = time.perf_counter() - transformed_at
+
+    if not dry_run:
+        file_path.write_bytes(code)
+    return FileResult(
+        file_path=file_path,
+        changed=True,
+        wraps=transformer.wraps,
+        wrap_types=dict(transformer.wrap_types),
+        timings=timings,
+        messages=extract_messages(new_tree, file_path=file_path, line_shift=line_shift) if extract else None,
+    )
 
-    code = ast.unparse(new_tree)
-    file_path.write_text(code)
+
+def update_py_files(file_paths: list[Path], *, dry_run: bool = False, extract: bool = False) -> list[FileResult]:
+    """Update the batch of python files collecting the errors to the results instead of raising them.
+
+    Args:
+        file_paths (list[Path]): The file paths to update.
+        dry_run (bool): Don't write the files, only report whether they would change.
+        extract (bool): Extract the gettext messages from the transformed modules.
+
+    Returns:
+        list[FileResult]: The results for every file.
+    """
+    results = []
+    for file_path in file_paths:
+        try:
+            results.append(update_py_file(file_path=file_path, dry_run=dry_run, extract=extract))
+        except Exception as error:  # noqa: BLE001, PERF203
+            results.append(FileResult(file_path=file_path, error=f"{type(error).__name__}: {error}"))
+    return results
@@ -0,0 +1,60 @@
+import subprocess
+from pathlib import Path
+
+from django_translate_gettext.constants import FORMAT_MAX_ARGS_LENGTH
+
+FORMAT_COMMAND = ("ruff", "format")
+
+
+def chunk_file_paths(file_paths: list[Path], *, max_length: int = FORMAT_MAX_ARGS_LENGTH) -> list[list[Path]]:
+    """Split the file paths to the chunks fitting the command line length limit.
+
+    Args:
+        file_paths (list[Path]): The file paths to split.
+        max_length (int): The max length of the arguments for the single call.
+
+    Returns:
+        list[list[Path]]: The list of chunks.
+    """
+    chunks, chunk, length = [], [], 0
+    for file_path in file_paths:
+        size = len(str(file_path)) + 1
+        if chunk and length + size > max_length:
+            chunks.append(chunk)
+            chunk, length = [], 0
+        chunk.append(file_path)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def run_formatter(file_paths: list[Path]) -> subprocess.CompletedProcess:
+    arguments = [*FORMAT_COMMAND, *(str(file_path) for file_path in file_paths)]
+    return subprocess.run(arguments, capture_output=True, text=True, check=False)  # noqa: S603
+
+
+def format_py_files(file_paths: list[Path]) -> dict[Path, str]:
+    """Format the python files with the single ruff call for every chunk of the files.
+
+    The files of the failed chunk are formatted one by one to report the errors per file.
+
+    Args:
+        file_paths (list[Path]): The file paths to format.
+
+    Returns:
+        dict[Path, str]: The mapping of the files failed to format to the error messages.
+    """
+    errors = {}
+    for chunk in chunk_file_paths(file_paths):
+        try:
+            if run_formatter(chunk).returncode == 0:
+                continue
+        except FileNotFoundError:
+            return dict.fromkeys(file_paths, f"{FORMAT_COMMAND[0]} is not installed.")
+
+        for file_path in chunk:
+            result = run_formatter([file_path])
+            if result.returncode != 0:
+                errors[file_path] = (result.stderr or result.stdout).strip()
+    return errors
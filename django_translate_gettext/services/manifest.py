@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from django.conf import settings
+
+from django_translate_gettext.constants import CACHE_PATH, PACKAGE_NAME
+from django_translate_gettext.services.po import get_default_file_mode
+
+VOLATILE_CATALOG_HEADERS = (b'"POT-Creation-Date:', b'"PO-Revision-Date:')
+
+
+def get_tool_version() -> str:
+    try:
+        return version(PACKAGE_NAME)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def hash_file(file_path: Path, *, kind: str = "files") -> str | None:
+    """Hash the file content, the volatile catalog headers are ignored to hash the catalogs.
+
+    Args:
+        file_path (Path): The file path to hash.
+        kind (str): The kind of the file, files, catalogs or compiled catalogs.
+
+    Returns:
+        str | None: The content hash or None if the file does not exist.
+    """
+    try:
+        content = file_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    if kind in {"catalogs", "compiled"}:
+        content = b"\n".join(line for line in content.split(b"\n") if not line.startswith(VOLATILE_CATALOG_HEADERS))
+    return hashlib.sha256(content).hexdigest()
+
+
+class Manifest:
+    """The content hashes of the processed source files and catalogs stored next to the project.
+
+    The manifest written by another tool version is ignored, so the upgraded transformer processes all files again.
+    """
+
+    kinds = ("files", "catalogs", "compiled")
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path or getattr(settings, "TRANSLATE_GETTEXT_CACHE_PATH", CACHE_PATH))
+        self.version = get_tool_version()
+        self.lock = threading.Lock()
+        self.hashes: dict[str, dict[str, str]] = self.load()
+
+    def __len__(self) -> int:
+        return sum(len(hashes) for hashes in self.hashes.values())
+
+    def load(self) -> dict[str, dict[str, str]]:
+        empty = {kind: {} for kind in self.kinds}
+        try:
+            data = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return empty
+
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return empty
+        return {kind: dict(data.get(kind, {})) for kind in self.kinds}
+
+    def get_key(self, file_path: Path) -> str:
+        return os.path.relpath(file_path.resolve(), self.path.resolve().parent)
+
+    def is_unchanged(self, file_path: Path, *, kind: str = "files") -> bool:
+        """Check whether the file content is the same as it was after the last run.
+
+        Args:
+            file_path (Path): The file path to check.
+            kind (str): The kind of the file, files or catalogs.
+
+        Returns:
+            bool: True if the file was processed and not changed since.
+        """
+        with self.lock:
+            stored = self.hashes[kind].get(self.get_key(file_path))
+        return stored is not None and stored == hash_file(file_path, kind=kind)
+
+    def update(self, file_path: Path, *, kind: str = "files") -> None:
+        content_hash = hash_file(file_path, kind=kind)
+        with self.lock:
+            if content_hash is None:
+                self.hashes[kind].pop(self.get_key(file_path), None)
+            else:
+                self.hashes[kind][self.get_key(file_path)] = content_hash
+
+    def save(self) -> None:
+        with self.lock:
+            content = json.dumps({"version": self.version, **self.hashes}, indent=2, sort_keys=True)
+
+        descriptor, temp_name = tempfile.mkstemp(dir=self.path.resolve().parent, prefix=f"{self.path.name}.")
+        with os.fdopen(descriptor, "w") as file:
+            file.write(content)
+        temp_file = Path(temp_name)
+        temp_file.chmod(self.path.stat().st_mode if self.path.exists() else get_default_file_mode())
+        temp_file.replace(self.path)
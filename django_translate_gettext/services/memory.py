@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from django.conf import settings
+
+from django_translate_gettext.constants import MEMORY_MAX_SIZE, MEMORY_PATH, MEMORY_QUERY_SIZE
+
+
+class MemoryEntry(NamedTuple):
+    source: str
+    source_lang: str
+    target_lang: str
+    backend: str
+    translated: str
+
+
+class TranslationMemory:
+    """The on-disk translation memory shared across the languages, runs and locale paths.
+
+    The translations are stored in the SQLite database keyed by the source text, source language, target language
+    and translator backend. The least recently used entries are evicted when the memory exceeds the max size.
+    """
+
+    def __init__(self, path: Path | str | None = None, *, max_size: int | None = None):
+        self.path = Path(path or getattr(settings, "TRANSLATE_GETTEXT_MEMORY_PATH", MEMORY_PATH))
+        self.max_size = max_size or getattr(settings, "TRANSLATE_GETTEXT_MEMORY_MAX_SIZE", MEMORY_MAX_SIZE)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                used_at REAL NOT NULL,
+                PRIMARY KEY (source, source_lang, target_lang, backend)
+            );
+            CREATE INDEX IF NOT EXISTS translations_used_at ON translations (used_at);
+            """
+        )
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get_many(self, sources: Iterable[str], *, source_lang: str, target_lang: str, backend: str) -> dict[str, str]:
+        """Get the stored translations for the source texts and mark them as recently used.
+
+        Args:
+            sources (Iterable[str]): The source texts to look up.
+            source_lang (str): The source language code.
+            target_lang (str): The target language code.
+            backend (str): The translator backend name.
+
+        Returns:
+            dict[str, str]: The mapping of the found source texts to the translated strings.
+        """
+        result = {}
+        sources = list(dict.fromkeys(sources))
+        with self.lock, self.connection:
+            for start in range(0, len(sources), MEMORY_QUERY_SIZE):
+                chunk = sources[start : start + MEMORY_QUERY_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT source, translated FROM translations WHERE source_lang = ? AND target_lang = ? "  # noqa: S608
+                    f"AND backend = ? AND source IN ({placeholders})",
+                    (source_lang, target_lang, backend, *chunk),
+                ).fetchall()
+                result.update(rows)
+
+            self.connection.executemany(
+                "UPDATE translations SET used_at = ? WHERE source = ? AND source_lang = ? AND target_lang = ? "
+                "AND backend = ?",
+                [(time.time(), source, source_lang, target_lang, backend) for source in result],
+            )
+        return result
+
+    def set_many(self, translations: dict[str, str], *, source_lang: str, target_lang: str, backend: str) -> None:
+        """Store the translations to the memory.
+
+        Args:
+            translations (dict[str, str]): The mapping of the source texts to the translated strings.
+            source_lang (str): The source language code.
+            target_lang (str): The target language code.
+            backend (str): The translator backend name.
+
+        Returns:
+            None
+        """
+        self.import_entries(
+            MemoryEntry(source, source_lang, target_lang, backend, translated)
+            for source, translated in translations.items()
+            if translated
+        )
+
+    def import_entries(self, entries: Iterable[MemoryEntry]) -> int:
+        """Store the entries to the memory and evict the least recently used ones exceeding the max size.
+
+        Args:
+            entries (Iterable[MemoryEntry]): The entries to store.
+
+        Returns:
+            int: The number of the stored entries.
+        """
+        now = time.time()
+        rows = [(*entry, now) for entry in entries]
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.evict()
+        return len(rows)
+
+    def export_entries(self) -> Iterator[MemoryEntry]:
+        """Iterate over all entries stored in the memory.
+
+        Returns:
+            Iterator[MemoryEntry]: The stored entries.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT source, source_lang, target_lang, backend, translated FROM translations ORDER BY used_at"
+            ).fetchall()
+        return (MemoryEntry(*row) for row in rows)
+
+    def evict(self) -> None:
+        overflow = self.connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0] - self.max_size
+        if overflow <= 0:
+            return
+        self.connection.execute(
+            "DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations ORDER BY used_at LIMIT ?)",
+            (overflow,),
+        )
+
+    def clear(self) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM translations")
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,95 @@
+import array
+import os
+import struct
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+
+from django_translate_gettext.services.po import PoEntry, iter_po_file
+
+MO_MAGIC = 0x950412DE
+MO_HEADER_SIZE = 7 * 4
+CONTEXT_SEPARATOR = "\x04"
+PLURAL_SEPARATOR = "\x00"
+
+
+def get_mo_message(entry: PoEntry) -> tuple[str, str] | None:
+    """Get the mo file key and value for the entry like msgfmt does.
+
+    The untranslated and fuzzy entries are skipped, the header is kept even if it is fuzzy.
+
+    Args:
+        entry (PoEntry): The po file entry.
+
+    Returns:
+        tuple[str, str] | None: The key and value or None if the entry is not compiled.
+    """
+    if entry.msgid is None:
+        return None
+    if not entry.is_header and (not entry.is_translated or "fuzzy" in entry.flags):
+        return None
+
+    key = entry.msgid if entry.msgctxt is None else f"{entry.msgctxt}{CONTEXT_SEPARATOR}{entry.msgid}"
+    if not entry.is_plural:
+        return key, entry.msgstr
+    key = f"{key}{PLURAL_SEPARATOR}{entry.msgid_plural}"
+    return key, PLURAL_SEPARATOR.join(msgstr for _, msgstr in sorted(entry.msgstr_plural.items()))
+
+
+def build_mo(entries: Iterable[PoEntry]) -> bytes:
+    """Build the GNU mo file content without the hash table.
+
+    Args:
+        entries (Iterable[PoEntry]): The po file entries.
+
+    Returns:
+        bytes: The mo file content.
+    """
+    messages = {}
+    for entry in entries:
+        if (message := get_mo_message(entry)) is not None:
+            messages[message[0].encode()] = message[1].encode()
+
+    keys = sorted(messages)
+    ids, strs = b"", b""
+    offsets = []
+    for key in keys:
+        offsets.append((len(ids), len(key), len(strs), len(messages[key])))
+        ids += key + b"\x00"
+        strs += messages[key] + b"\x00"
+
+    keys_start = MO_HEADER_SIZE + len(keys) * 2 * 8
+    values_start = keys_start + len(ids)
+    key_offsets, value_offsets = [], []
+    for key_offset, key_length, value_offset, value_length in offsets:
+        key_offsets.extend((key_length, key_offset + keys_start))
+        value_offsets.extend((value_length, value_offset + values_start))
+
+    header = struct.pack(
+        "Iiiiiii", MO_MAGIC, 0, len(keys), MO_HEADER_SIZE, MO_HEADER_SIZE + len(keys) * 8, 0, keys_start
+    )
+    return header + array.array("i", key_offsets).tobytes() + array.array("i", value_offsets).tobytes() + ids + strs
+
+
+def compile_po_file(po_file: Path) -> Path:
+    """Compile the po file to the mo file next to it, the mo file is replaced atomically.
+
+    Args:
+        po_file (Path): The po file path.
+
+    Returns:
+        Path: The mo file path.
+    """
+    mo_file = po_file.with_suffix(".mo")
+    content = build_mo(iter_po_file(po_file))
+    descriptor, temp_name = tempfile.mkstemp(dir=mo_file.parent, prefix=f".{mo_file.name}.", suffix=".tmp")
+    temp_file = Path(temp_name)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+        temp_file.chmod(0o644)
+        temp_file.replace(mo_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+    return mo_file
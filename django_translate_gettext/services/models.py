@@ -1,8 +1,95 @@
+import functools
+import inspect
+from collections import defaultdict
+from pathlib import Path
+
+from django.apps import apps
 from django.db.models import Model
 
 
+def get_model_file(model: type[Model]) -> Path | None:
+    """Get the source file defining the model relative to the current directory.
+
+    The models defined outside the current directory, like the installed packages, are skipped,
+    their files must never be rewritten.
+
+    Args:
+        model (type[Model]): The model class.
+
+    Returns:
+        Path | None: The source file path or None for the models without the source file in the project.
+    """
+    try:
+        source_file = inspect.getsourcefile(model)
+    except (OSError, TypeError):
+        return None
+    if source_file is None:
+        return None
+
+    file_path = Path(source_file).resolve()
+    try:
+        return file_path.relative_to(Path.cwd())
+    except ValueError:
+        return None
+
+
+def get_app_path(app_label: str) -> Path | None:
+    try:
+        return Path(apps.get_app_config(app_label).path).resolve()
+    except LookupError:
+        return None
+
+
+class ModelIndex:
+    """The index of the models by the app label and of their source files, built once for the project.
+
+    The concrete and proxy models are taken from the app registry, the abstract models are collected
+    with the single walk over the model subclasses.
+    """
+
+    def __init__(self) -> None:
+        self.models: dict[str, set[type[Model]]] = defaultdict(set)
+        self.files: dict[type[Model], Path | None] = {}
+        for model in (*apps.get_models(include_auto_created=True), *self.fetch_abstract_models()):
+            self.models[model._meta.app_label].add(model)  # noqa: SLF001
+            self.files[model] = get_model_file(model)
+
+    @staticmethod
+    def fetch_abstract_models() -> set[type[Model]]:
+        result, stack = set(), [Model]
+        while stack:
+            for subclass in stack.pop().__subclasses__():
+                if subclass not in result:
+                    result.add(subclass)
+                    stack.append(subclass)
+        return {model for model in result if model._meta.abstract}  # noqa: SLF001
+
+    def get_models(self, app_label: str) -> set[type[Model]]:
+        return set(self.models.get(app_label, ()))
+
+    def get_model_files(self, app_label: str) -> set[Path]:
+        """Get the model source files of the app label inside the app directory.
+
+        Args:
+            app_label (str): The app label.
+
+        Returns:
+            set[Path]: The model source files.
+        """
+        app_path = get_app_path(app_label)
+        files = {self.files[model] for model in self.models.get(app_label, ()) if self.files[model] is not None}
+        if app_path is None:
+            return files
+        return {file_path for file_path in files if file_path.resolve().is_relative_to(app_path)}
+
+
+@functools.cache
+def get_model_index() -> ModelIndex:
+    return ModelIndex()
+
+
 def get_all_app_models(app_label: str) -> set[Model]:
-    """Get all models for the app label including the abstract models.
+    """Get all models for the app label including the abstract and proxy models.
 
     Args:
         app_label (str): The app label to get the models for.
@@ -10,9 +97,16 @@ def get_all_app_models(app_label: str) -> set[Model]:
     Returns:
         set[Model]: The set of models for the app label.
     """
-    result = set()
-    generation = {Model}
-    while generation:
-        generation = {sc for c in generation for sc in c.__subclasses__()}
-        result.update([c for c in generation if c._meta.app_label == app_label])  # noqa: SLF001
-    return result
+    return get_model_index().get_models(app_label)
+
+
+def get_app_model_files(app_label: str) -> set[Path]:
+    """Get the source files defining the models of the app label.
+
+    Args:
+        app_label (str): The app label to get the model files for.
+
+    Returns:
+        set[Path]: The set of the model source files.
+    """
+    return get_model_index().get_model_files(app_label)
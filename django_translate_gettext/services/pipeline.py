@@ -0,0 +1,217 @@
+import asyncio
+import random
+import time
+from collections.abc import Coroutine, Iterable
+from typing import Any, NamedTuple, TypeVar
+
+from deep_translator.exceptions import TooManyRequests
+from django.conf import settings
+
+from django_translate_gettext.constants import BACKEND_LIMITS, BATCH_BACKOFF, BATCH_DELIMITER, RATE_LIMIT_BACKOFF
+from django_translate_gettext.exceptions import TranslatorError
+from django_translate_gettext.services.checkpoints import Checkpoint
+from django_translate_gettext.services.translators import RETRY_ERRORS, PoFileTranslator
+
+T = TypeVar("T")
+
+
+async def run_tasks(coroutines: Iterable[Coroutine[Any, Any, T]]) -> list[T]:
+    """Run the coroutines concurrently, the rest are cancelled and awaited if one of them fails.
+
+    Args:
+        coroutines (Iterable[Coroutine]): The coroutines to run.
+
+    Returns:
+        list: The results in the order of the coroutines.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coroutine) for coroutine in coroutines]
+    except BaseExceptionGroup as errors:
+        raise errors.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
+class BackendLimits(NamedTuple):
+    concurrency: int
+    rate: float
+    burst: int
+
+
+def get_backend_limits(backend: str) -> BackendLimits:
+    """Get the concurrency and rate limits for the translator backend.
+
+    The default limits are overridden with the TRANSLATE_GETTEXT_BACKEND_LIMITS setting.
+
+    Args:
+        backend (str): The translator backend name.
+
+    Returns:
+        BackendLimits: The backend limits.
+    """
+    limits = BACKEND_LIMITS.get(backend, BACKEND_LIMITS["google"]) | getattr(
+        settings, "TRANSLATE_GETTEXT_BACKEND_LIMITS", {}
+    ).get(backend, {})
+    return BackendLimits(
+        concurrency=max(int(limits["concurrency"]), 1),
+        rate=max(float(limits["rate"]), 0.001),
+        burst=max(int(limits["burst"]), 1),
+    )
+
+
+class TokenBucket:
+    """The token bucket rate limiter shared by all requests to the backend."""
+
+    def __init__(self, *, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(self.capacity, self.tokens + max(now - self.updated_at, 0) * self.rate)
+                self.updated_at = max(now, self.updated_at)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, delay: float) -> None:
+        """Stop handing out the tokens for the delay, the backend asked to slow down.
+
+        The bucket is emptied and starts refilling at the end of the pause, so the requests resume at the rate
+        instead of the burst.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        self.tokens = 0
+        self.updated_at = self.paused_until
+
+
+class AsyncTranslationPipeline:
+    """Translate the po files for all lang codes and locale paths through the single request scheduler.
+
+    Every chunk of every catalog is scheduled at once, the requests are bounded by the backend concurrency
+    and the shared token bucket, so the run uses the allowed quota without getting rate limited.
+    """
+
+    def __init__(self, translators: list[PoFileTranslator], *, retries: int | None = None):
+        self.translators = translators
+        self.retries = retries
+        self.limits = {translator.backend: get_backend_limits(translator.backend) for translator in translators}
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def run(self) -> dict[str, Exception | None]:
+        return asyncio.run(self.translate())
+
+    async def translate(self) -> dict[str, Exception | None]:
+        """Translate the po files for all translators.
+
+        Returns:
+            dict[str, Exception | None]: The mapping of the lang codes to the raised errors.
+        """
+        for backend, limits in self.limits.items():
+            self.semaphores[backend] = asyncio.Semaphore(limits.concurrency)
+            self.buckets[backend] = TokenBucket(rate=limits.rate, capacity=limits.burst)
+
+        results = await asyncio.gather(
+            *(self.translate_lang_code(translator) for translator in self.translators), return_exceptions=True
+        )
+        return {
+            translator.lang_code: result if isinstance(result, Exception) else None
+            for translator, result in zip(self.translators, results, strict=True)
+        }
+
+    async def translate_lang_code(self, translator: PoFileTranslator) -> None:
+        """Translate every unique msgid of all catalogs of the lang code once and fill all catalogs with them.
+
+        Args:
+            translator (PoFileTranslator): The translator for the lang code.
+
+        Returns:
+            None
+        """
+        catalogs = await asyncio.to_thread(translator.plan_catalogs)
+        if not catalogs:
+            return
+
+        with translator.open_checkpoint(catalogs) as checkpoint:
+            msgids = translator.unique_msgids(catalogs)
+            translator.progress.add_total(translator.lang_code, "translate", len(msgids))
+            result = await asyncio.to_thread(translator.fetch_cached, msgids, checkpoint=checkpoint)
+            translator.progress.advance(translator.lang_code, "translate", len(result))
+            chunks = translator.chunk_msgids([msgid for msgid in msgids if msgid not in result])
+
+            translated = {}
+            for chunk_result in await run_tasks(
+                self.translate_chunk(translator, chunk, checkpoint=checkpoint) for chunk in chunks
+            ):
+                translated.update(chunk_result)
+
+            await asyncio.to_thread(translator.store_memory, translated)
+            await asyncio.to_thread(translator.fill_catalogs, catalogs, result | translated)
+
+    async def translate_chunk(
+        self, translator: PoFileTranslator, chunk: list[str], *, checkpoint: Checkpoint
+    ) -> dict[str, str]:
+        result = await self.request_chunk(translator, chunk)
+        translator.progress.advance(translator.lang_code, "translate", len(result))
+        if checkpoint.add(result):
+            await asyncio.to_thread(checkpoint.flush)
+        return result
+
+    async def request_chunk(self, translator: PoFileTranslator, chunk: list[str]) -> dict[str, str]:
+        single, joined = translator.split_chunk(chunk)
+        texts = await run_tasks(self.request(translator, msgid) for msgid in single)
+        result = dict(zip(single, texts, strict=True))
+        if len(joined) > 1:
+            translated = translator.map_translated(joined, await self.request(translator, BATCH_DELIMITER.join(joined)))
+            if translated is not None:
+                return result | translated
+
+        texts = await run_tasks(self.request(translator, msgid) for msgid in joined)
+        return result | dict(zip(joined, texts, strict=True))
+
+    async def request(self, translator: PoFileTranslator, text: str) -> str:
+        """Send the single request to the backend, waiting for the free slot and the rate limiter token.
+
+        The rate limited requests pause the whole backend bucket, the other failed requests are retried
+        with the exponential backoff.
+
+        Args:
+            translator (PoFileTranslator): The translator for the lang code.
+            text (str): The text to translate.
+
+        Returns:
+            str: The translated text.
+        """
+        retries = translator.retries if self.retries is None else self.retries
+        bucket, semaphore = self.buckets[translator.backend], self.semaphores[translator.backend]
+        for attempt in range(retries + 1):
+            async with semaphore:
+                await bucket.acquire()
+                translator.progress.add_request(translator.lang_code, retry=attempt > 0)
+                try:
+                    return await asyncio.to_thread(translator.translator.translate, text)
+                except TooManyRequests as error:
+                    delay = RATE_LIMIT_BACKOFF * 2**attempt
+                    bucket.pause(delay)
+                    last_error = error
+                except RETRY_ERRORS as error:
+                    delay = BATCH_BACKOFF * 2**attempt
+                    last_error = error
+
+            if attempt < retries:
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))  # noqa: S311
+
+        error_message = f"Failed to translate for lang code {translator.lang_code}: {last_error}"
+        raise TranslatorError(error_message) from last_error
@@ -0,0 +1,399 @@
+import functools
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+
+import django
+from django.utils.translation import to_locale
+
+from django_translate_gettext.exceptions import PoFileError
+from django_translate_gettext.services.extractors import CatalogMessage
+
+KEYWORD_PATTERN = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr)(?:\[(\d+)\])?\s+"(.*)"\s*$')
+STRING_PATTERN = re.compile(r'^"(.*)"\s*$')
+UNESCAPE_PATTERN = re.compile(r'\\(?:([ntr\\"abfv])|([0-7]{1,3})|x([0-9a-fA-F]{1,2}))')
+LINE_PATTERN = re.compile(r"[^\n]*\n|[^\n]+")
+PLURAL_FORMS_PATTERN = re.compile(r"Plural-Forms:\s*nplurals\s*=\s*(\d+)")
+
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", '"': '"', "a": "\a", "b": "\b", "f": "\f", "v": "\v"}
+UNESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\t": "\\t", "\r": "\\r"}
+
+
+def unescape(value: str) -> str:
+    """Unescape the po file quoted string content to the python string.
+
+    Args:
+        value (str): The content of the quoted po string.
+
+    Returns:
+        str: The unescaped string.
+    """
+
+    def replace(match: re.Match) -> str:
+        char, octal, hexadecimal = match.groups()
+        if char:
+            return ESCAPES[char]
+        return chr(int(octal, 8)) if octal else chr(int(hexadecimal, 16))
+
+    return UNESCAPE_PATTERN.sub(replace, value)
+
+
+def escape(value: str) -> str:
+    """Escape the python string to the po file quoted string content.
+
+    Args:
+        value (str): The string to escape.
+
+    Returns:
+        str: The escaped string.
+    """
+    return "".join(UNESCAPES.get(char, char) for char in value)
+
+
+def format_field(keyword: str, value: str) -> list[str]:
+    parts = LINE_PATTERN.findall(value)
+    if len(parts) <= 1:
+        return [f'{keyword} "{escape(value)}"']
+    return [f'{keyword} ""', *(f'"{escape(part)}"' for part in parts)]
+
+
+class PoEntry:
+    """The single po file entry with the unescaped field values.
+
+    The original lines are kept to write the untouched entries back as is.
+    """
+
+    __slots__ = ("changed", "comments", "lines", "msgctxt", "msgid", "msgid_plural", "msgstr", "msgstr_plural")
+
+    def __init__(self) -> None:
+        self.comments: list[str] = []
+        self.msgctxt: str | None = None
+        self.msgid: str | None = None
+        self.msgid_plural: str | None = None
+        self.msgstr: str = ""
+        self.msgstr_plural: dict[int, str] = {}
+        self.lines: list[str] = []
+        self.changed = False
+
+    def __repr__(self) -> str:
+        return f"PoEntry(msgctxt={self.msgctxt!r}, msgid={self.msgid!r})"
+
+    @property
+    def is_header(self) -> bool:
+        return self.msgid == "" and self.msgctxt is None
+
+    @property
+    def is_plural(self) -> bool:
+        return self.msgid_plural is not None
+
+    @property
+    def is_translated(self) -> bool:
+        if self.is_plural:
+            return bool(self.msgstr_plural) and all(self.msgstr_plural.values())
+        return bool(self.msgstr)
+
+    @property
+    def flags(self) -> set[str]:
+        return {
+            flag.strip() for comment in self.comments if comment.startswith("#,") for flag in comment[2:].split(",")
+        }
+
+    @property
+    def source_texts(self) -> list[str]:
+        """Get the texts to translate for the entry, the msgid and the msgid plural if any."""
+        if self.msgid is None or self.is_header or self.is_translated:
+            return []
+        return [self.msgid] if self.msgid_plural is None else [self.msgid, self.msgid_plural]
+
+    def translate(self, translations: dict[str, str]) -> "PoEntry":
+        """Fill the empty msgstr of the entry with the given translations.
+
+        Args:
+            translations (dict[str, str]): The mapping of the source texts to the translated strings.
+
+        Returns:
+            PoEntry: The same entry.
+        """
+        if not self.source_texts:
+            return self
+
+        if self.is_plural:
+            for index, msgstr in self.msgstr_plural.items():
+                source = self.msgid if index == 0 else self.msgid_plural
+                if not msgstr and translations.get(source):
+                    self.msgstr_plural[index] = translations[source]
+                    self.changed = True
+        elif translations.get(self.msgid):
+            self.msgstr = translations[self.msgid]
+            self.changed = True
+        return self
+
+    @property
+    def references(self) -> list[str]:
+        return [reference for comment in self.comments if comment.startswith("#:") for reference in comment[2:].split()]
+
+    def add_references(self, references: list[str]) -> "PoEntry":
+        """Add the missing source references to the entry comments.
+
+        Args:
+            references (list[str]): The file:line references of the message.
+
+        Returns:
+            PoEntry: The same entry.
+        """
+        existing = set(self.references)
+        new_references = [reference for reference in references if reference not in existing]
+        if not new_references:
+            return self
+
+        positions = [index for index, comment in enumerate(self.comments) if comment.startswith("#:")]
+        flags = [index for index, comment in enumerate(self.comments) if comment.startswith(("#,", "#|"))]
+        position = positions[-1] + 1 if positions else (flags[0] if flags else len(self.comments))
+        self.comments.insert(position, f"#: {' '.join(new_references)}")
+        self.changed = True
+        return self
+
+    @classmethod
+    def create(  # noqa: PLR0913
+        cls,
+        *,
+        msgid: str,
+        msgctxt: str | None = None,
+        msgid_plural: str | None = None,
+        references: list[str] | None = None,
+        plural_forms: int = 2,
+    ) -> "PoEntry":
+        entry = cls()
+        if references:
+            entry.comments.append(f"#: {' '.join(references)}")
+        entry.msgctxt = msgctxt
+        entry.msgid = msgid
+        entry.msgid_plural = msgid_plural
+        if msgid_plural is not None:
+            entry.msgstr_plural = dict.fromkeys(range(plural_forms), "")
+        entry.changed = True
+        return entry
+
+    def serialize(self) -> str:
+        if not self.changed:
+            return "\n".join(self.lines) + "\n"
+
+        lines = list(self.comments)
+        if self.msgctxt is not None:
+            lines.extend(format_field("msgctxt", self.msgctxt))
+        lines.extend(format_field("msgid", self.msgid or ""))
+        if self.msgid_plural is None:
+            lines.extend(format_field("msgstr", self.msgstr))
+        else:
+            lines.extend(format_field("msgid_plural", self.msgid_plural))
+            for index, msgstr in sorted(self.msgstr_plural.items()):
+                lines.extend(format_field(f"msgstr[{index}]", msgstr))
+        return "\n".join(lines) + "\n"
+
+
+class PoParser:
+    """The streaming po file parser yielding the entries one by one."""
+
+    def __init__(self, lines: Iterable[str], *, name: str = "<po>"):
+        self.lines = lines
+        self.name = name
+        self.entry = PoEntry()
+        self.field: tuple[str, int | None] | None = None
+
+    def __iter__(self) -> Iterator[PoEntry]:
+        for number, raw_line in enumerate(self.lines, start=1):
+            line = raw_line.rstrip("\r\n")
+            if not line.strip():
+                yield from self.flush()
+            elif line.startswith("#"):
+                if self.field and self.field[0] == "msgstr":
+                    yield from self.flush()
+                self.entry.comments.append(line)
+                self.entry.lines.append(line)
+            else:
+                yield from self.parse_line(line=line, number=number)
+        yield from self.flush()
+
+    def flush(self) -> Iterator[PoEntry]:
+        if self.entry.lines:
+            yield self.entry
+        self.entry = PoEntry()
+        self.field = None
+
+    def parse_line(self, *, line: str, number: int) -> Iterator[PoEntry]:
+        if match := STRING_PATTERN.match(line):
+            if self.field is None:
+                raise PoFileError(f"{self.name}:{number}: unexpected string continuation line.")
+            self.set_field(*self.field, value=unescape(match.group(1)), append=True)
+            self.entry.lines.append(line)
+            return
+
+        match = KEYWORD_PATTERN.match(line)
+        if match is None:
+            raise PoFileError(f"{self.name}:{number}: invalid line {line!r}.")
+
+        keyword, index, value = match.groups()
+        if keyword in ("msgctxt", "msgid") and self.field and self.field[0] == "msgstr":
+            yield from self.flush()
+
+        self.field = (keyword, None if index is None else int(index))
+        self.set_field(*self.field, value=unescape(value))
+        self.entry.lines.append(line)
+
+    def set_field(self, keyword: str, index: int | None, *, value: str, append: bool = False) -> None:
+        entry = self.entry
+        if keyword == "msgstr" and index is not None:
+            entry.msgstr_plural[index] = entry.msgstr_plural.get(index, "") + value if append else value
+            return
+
+        if append:
+            value = (getattr(entry, keyword) or "") + value
+        setattr(entry, keyword, value)
+
+
+def iter_po_file(po_file: Path) -> Iterator[PoEntry]:
+    """Iterate over the po file entries reading the file line by line.
+
+    Args:
+        po_file (Path): The po file path.
+
+    Returns:
+        Iterator[PoEntry]: The po file entries.
+    """
+    with po_file.open(encoding="utf-8") as file:
+        yield from PoParser(file, name=str(po_file))
+
+
+@functools.cache
+def get_default_file_mode() -> int:
+    """Get the mode of the new file under the process umask, the temporary files are created with 0600.
+
+    The umask can be read only by setting it, so it is read once.
+
+    Returns:
+        int: The file mode.
+    """
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_po_file(po_file: Path, entries: Iterable[PoEntry]) -> None:
+    """Write the entries to the temporary file and atomically replace the po file with it.
+
+    The entries may be lazily read from the same po file, it's replaced only after all entries are written.
+
+    Args:
+        po_file (Path): The po file path.
+        entries (Iterable[PoEntry]): The entries to write.
+
+    Returns:
+        None
+    """
+    descriptor, temp_name = tempfile.mkstemp(dir=po_file.parent, prefix=f".{po_file.name}.", suffix=".tmp")
+    temp_file = Path(temp_name)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            for index, entry in enumerate(entries):
+                if index:
+                    file.write("\n")
+                file.write(entry.serialize())
+        temp_file.chmod(po_file.stat().st_mode if po_file.exists() else get_default_file_mode())
+        temp_file.replace(po_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def get_plural_forms(lang_code: str) -> str | None:
+    """Get the Plural-Forms header of the language from the Django catalog like the makemessages command does.
+
+    Args:
+        lang_code (str): The language code.
+
+    Returns:
+        str | None: The Plural-Forms header or None if Django has no catalog for the language.
+    """
+    django_po = Path(django.__file__).parent / "conf" / "locale" / to_locale(lang_code) / "LC_MESSAGES" / "django.po"
+    if not django_po.exists():
+        return None
+
+    for entry in iter_po_file(django_po):
+        if entry.is_header:
+            return next((line for line in entry.msgstr.splitlines() if line.startswith("Plural-Forms:")), None)
+    return None
+
+
+def build_header_entry(lang_code: str) -> PoEntry:
+    """Build the header entry for the new catalog like the makemessages command does."""
+    entry = PoEntry.create(msgid="")
+    entry.comments = [
+        "# SOME DESCRIPTIVE TITLE.",
+        "# Copyright (C) YEAR THE PACKAGE'S COPYRIGHT HOLDER",
+        "# This file is distributed under the same license as the PACKAGE package.",
+        "# FIRST AUTHOR <EMAIL@ADDRESS>, YEAR.",
+        "#",
+        "#, fuzzy",
+    ]
+    headers = [
+        "Project-Id-Version: PACKAGE VERSION",
+        "Report-Msgid-Bugs-To: ",
+        f"POT-Creation-Date: {datetime.now(tz=UTC).strftime('%Y-%m-%d %H:%M%z')}",
+        "PO-Revision-Date: YEAR-MO-DA HO:MI+ZONE",
+        "Last-Translator: FULL NAME <EMAIL@ADDRESS>",
+        "Language-Team: LANGUAGE <LL@li.org>",
+        f"Language: {lang_code}",
+        "MIME-Version: 1.0",
+        "Content-Type: text/plain; charset=UTF-8",
+        "Content-Transfer-Encoding: 8bit",
+    ]
+    if plural_forms := get_plural_forms(lang_code):
+        headers.append(plural_forms)
+    entry.msgstr = "".join(f"{header}\n" for header in headers)
+    return entry
+
+
+def merge_po_file(po_file: Path, messages: dict[tuple[str | None, str], CatalogMessage], *, lang_code: str) -> int:
+    """Merge the extracted messages into the catalog, the catalog is created if it does not exist.
+
+    The existing entries get the missing references, the new messages are appended with the empty msgstr.
+    The entries missing from the messages are kept as is, the messages may be extracted from the part of the files.
+
+    Args:
+        po_file (Path): The catalog path.
+        messages (dict[tuple[str | None, str], CatalogMessage]): The messages by the msgctxt and msgid.
+        lang_code (str): The catalog language code.
+
+    Returns:
+        int: The number of the added messages.
+    """
+    pending = dict(messages)
+    added = 0
+
+    def merge_entries() -> Iterator[PoEntry]:
+        nonlocal added
+        plural_forms = 2
+        entries = iter_po_file(po_file) if po_file.exists() else iter([build_header_entry(lang_code)])
+        for entry in entries:
+            if entry.is_header and (match := PLURAL_FORMS_PATTERN.search(entry.msgstr)):
+                plural_forms = int(match.group(1))
+            elif entry.msgid is not None and (message := pending.pop((entry.msgctxt, entry.msgid), None)):
+                entry.add_references(message.references)
+            yield entry
+
+        for message in pending.values():
+            added += 1
+            yield PoEntry.create(
+                msgid=message.msgid,
+                msgctxt=message.msgctxt,
+                msgid_plural=message.msgid_plural,
+                references=message.references,
+                plural_forms=plural_forms,
+            )
+
+    po_file.parent.mkdir(parents=True, exist_ok=True)
+    write_po_file(po_file, merge_entries())
+    return added
@@ -0,0 +1,209 @@
+import json
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from django_translate_gettext.constants import PROGRESS_INTERVAL
+
+PROGRESS_STAGES = ("plan", "translate", "write")
+METRICS_FORMATS = ("jsonl", "prometheus")
+
+
+class StageProgress:
+    __slots__ = ("done", "started_at", "total")
+
+    def __init__(self) -> None:
+        self.done = 0
+        self.total = 0
+        self.started_at: float | None = None
+
+
+class LangProgress:
+    __slots__ = ("cache_hits", "cache_misses", "requests", "retries", "stages")
+
+    def __init__(self) -> None:
+        self.stages = {stage: StageProgress() for stage in PROGRESS_STAGES}
+        self.requests = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class ProgressTracker:
+    """The thread-safe counters of the translation progress per lang code and stage.
+
+    The stages are: plan counts the catalogs to read, translate counts the unique msgids,
+    write counts the catalogs to write.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.langs: dict[str, LangProgress] = {}
+
+    def get_lang(self, lang_code: str) -> LangProgress:
+        if lang_code not in self.langs:
+            self.langs[lang_code] = LangProgress()
+        return self.langs[lang_code]
+
+    def add_total(self, lang_code: str, stage: str, count: int) -> None:
+        with self.lock:
+            progress = self.get_lang(lang_code).stages[stage]
+            progress.total += count
+            if progress.started_at is None:
+                progress.started_at = time.monotonic()
+
+    def advance(self, lang_code: str, stage: str, count: int = 1) -> None:
+        with self.lock:
+            self.get_lang(lang_code).stages[stage].done += count
+
+    def add_request(self, lang_code: str, *, retry: bool = False) -> None:
+        with self.lock:
+            lang = self.get_lang(lang_code)
+            lang.requests += 1
+            lang.retries += int(retry)
+
+    def add_cache(self, lang_code: str, *, hits: int, misses: int) -> None:
+        with self.lock:
+            lang = self.get_lang(lang_code)
+            lang.cache_hits += hits
+            lang.cache_misses += misses
+
+    def snapshot(self) -> list[dict]:
+        """Get the current metrics for every lang code and stage.
+
+        Returns:
+            list[dict]: The metrics with the done and total counts, requests per second, cache hit rate,
+                retries and the estimated seconds left for the stage.
+        """
+        now = time.monotonic()
+        rows = []
+        with self.lock:
+            for lang_code, lang in sorted(self.langs.items()):
+                elapsed = max(now - self.started_at, 1e-9)
+                lookups = lang.cache_hits + lang.cache_misses
+                for stage, progress in lang.stages.items():
+                    if not progress.total:
+                        continue
+                    stage_elapsed = max(now - (progress.started_at or now), 1e-9)
+                    rate = progress.done / stage_elapsed
+                    left = max(progress.total - progress.done, 0)
+                    eta = round(left / rate, 1) if rate else None
+                    rows.append({
+                        "lang": lang_code,
+                        "stage": stage,
+                        "done": progress.done,
+                        "total": progress.total,
+                        "requests": lang.requests,
+                        "requests_per_second": round(lang.requests / elapsed, 3),
+                        "cache_hit_rate": round(lang.cache_hits / lookups, 4) if lookups else None,
+                        "retries": lang.retries,
+                        "eta_seconds": eta if left else 0.0,
+                    })
+        return rows
+
+
+def format_progress(row: dict) -> str:
+    eta = "?" if row["eta_seconds"] is None else f"{row['eta_seconds']:.0f}s"
+    hit_rate = "-" if row["cache_hit_rate"] is None else f"{row['cache_hit_rate']:.0%}"
+    return (
+        f"[{row['lang']}] {row['stage']}: {row['done']}/{row['total']}, {row['requests_per_second']} req/s, "
+        f"cache hits {hit_rate}, retries {row['retries']}, ETA {eta}"
+    )
+
+
+def write_jsonl_metrics(path: Path, rows: list[dict]) -> None:
+    timestamp = round(time.time(), 3)
+    with path.open("a", encoding="utf-8") as file:
+        file.writelines(json.dumps({"timestamp": timestamp, **row}, ensure_ascii=False) + "\n" for row in rows)
+
+
+def write_prometheus_metrics(path: Path, rows: list[dict]) -> None:
+    """Write the metrics in the Prometheus text format replacing the file atomically for the textfile collector.
+
+    Args:
+        path (Path): The textfile path.
+        rows (list[dict]): The metrics snapshot rows.
+
+    Returns:
+        None
+    """
+    metrics = {
+        "done": "The number of the processed items of the stage.",
+        "total": "The number of the items of the stage.",
+        "eta_seconds": "The estimated seconds left for the stage.",
+        "requests": "The number of the translator requests.",
+        "requests_per_second": "The translator requests per second.",
+        "cache_hit_rate": "The translation memory hit rate.",
+        "retries": "The number of the retried translator requests.",
+    }
+    lines = []
+    for metric, description in metrics.items():
+        name = f"translate_gettext_{metric}"
+        lines.extend([f"# HELP {name} {description}", f"# TYPE {name} gauge"])
+        for row in rows:
+            if row[metric] is None:
+                continue
+            labels = f'lang="{row["lang"]}",stage="{row["stage"]}"'
+            lines.append(f"{name}{{{labels}}} {row[metric]}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=path.parent, prefix=f".{path.name}.", delete=False) as file:
+        file.write("\n".join(lines) + "\n")
+    temp_file = Path(file.name)
+    temp_file.chmod(0o644)
+    temp_file.replace(path)
+
+
+class ProgressReporter:
+    """Report the tracker snapshot periodically from the background thread until stopped.
+
+    The snapshot is passed to the output callback and written to the metrics file in the JSON lines
+    or the Prometheus textfile format.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        tracker: ProgressTracker,
+        *,
+        interval: float = PROGRESS_INTERVAL,
+        output: Callable[[str], None] | None = None,
+        metrics_path: Path | None = None,
+        metrics_format: str = "jsonl",
+    ):
+        self.tracker = tracker
+        self.interval = max(interval, 0.1)
+        self.output = output
+        self.metrics_path = metrics_path
+        self.metrics_format = metrics_format
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="translate-gettext-progress", daemon=True)
+
+    def __enter__(self) -> "ProgressReporter":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stopped.set()
+        self.thread.join()
+        self.report()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.report()
+
+    def report(self) -> None:
+        rows = self.tracker.snapshot()
+        if not rows:
+            return
+
+        if self.output is not None:
+            for row in rows:
+                self.output(format_progress(row))
+        if self.metrics_path is not None:
+            if self.metrics_format == "prometheus":
+                write_prometheus_metrics(self.metrics_path, rows)
+            else:
+                write_jsonl_metrics(self.metrics_path, rows)
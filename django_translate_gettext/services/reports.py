@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django_translate_gettext.services.files import FileResult
+
+STAGES = ("discovery", "parse", "transform", "unparse", "format", "makemessages", "translate", "compile")
+
+
+class StageTimer:
+    """The wall time accumulated for every stage of the run."""
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started_at)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+class RunReport:
+    """The machine-readable report of the translate command run."""
+
+    def __init__(self, *, mode: str):
+        self.mode = mode
+        self.timer = StageTimer()
+        self.file_results: list[FileResult] = []
+        self.pending: dict[str, list[str]] = {}
+
+    @property
+    def changed_files(self) -> list[FileResult]:
+        return [result for result in self.file_results if result.changed]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changed_files) or any(self.pending.values())
+
+    def add_file_results(self, results: list[FileResult]) -> None:
+        """Add the file results and their parse, transform and unparse timings summed up over the files.
+
+        Args:
+            results (list[FileResult]): The file results.
+
+        Returns:
+            None
+        """
+        self.file_results.extend(results)
+        for result in results:
+            for stage, seconds in (result.timings or {}).items():
+                self.timer.add(stage, seconds)
+
+    def add_pending(self, lang_code: str, msgids: list[str]) -> None:
+        self.pending.setdefault(lang_code, []).extend(msgids)
+
+    def to_dict(self) -> dict:
+        wrap_types = Counter()
+        for result in self.changed_files:
+            wrap_types.update(result.wrap_types or {})
+
+        return {
+            "mode": self.mode,
+            "files": {
+                "total": len(self.file_results),
+                "changed": [str(result.file_path) for result in self.changed_files],
+                "errors": {str(result.file_path): result.error for result in self.file_results if result.error},
+            },
+            "wraps": {
+                "total": sum(result.wraps for result in self.changed_files),
+                "by_type": dict(sorted(wrap_types.items())),
+            },
+            "pending": {
+                lang_code: {"count": len(msgids), "msgids": msgids} for lang_code, msgids in self.pending.items()
+            },
+            "timings": {stage: round(seconds, 6) for stage, seconds in self.timer.timings.items()},
+        }
@@ -0,0 +1,120 @@
+import ast
+import json
+from typing import NamedTuple
+
+GETTEXT_IMPORT = "from django.utils.translation import gettext_lazy as _"
+
+
+class SourceEdit(NamedTuple):
+    """The replacement of the source span, the start equals to the end for the insertions.
+
+    The positions are the ast (lineno, col_offset) pairs, the col offsets are the utf-8 byte offsets.
+    """
+
+    start: tuple[int, int]
+    end: tuple[int, int]
+    text: str
+
+
+def has_position(node: ast.AST) -> bool:
+    return getattr(node, "lineno", None) is not None and getattr(node, "end_lineno", None) is not None
+
+
+def start_of(node: ast.AST) -> tuple[int, int]:
+    return node.lineno, node.col_offset
+
+
+def end_of(node: ast.AST) -> tuple[int, int]:
+    return node.end_lineno, node.end_col_offset
+
+
+def gettext_call_source(constant: object) -> str:
+    literal = json.dumps(constant, ensure_ascii=False) if isinstance(constant, str) else repr(constant)
+    return f"_({literal})"
+
+
+def get_line_offsets(source: bytes) -> list[int]:
+    """Get the byte offsets of the line starts, the index is the ast lineno."""
+    offsets = [0, 0]
+    for line in source.splitlines(keepends=True):
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def find_import_position(tree: ast.Module) -> tuple[int, int] | None:
+    """Find the line to insert the gettext import to, right after the module imports or the docstring.
+
+    Args:
+        tree (ast.Module): The parsed module.
+
+    Returns:
+        tuple[int, int] | None: The position of the line start or None if the module already imports gettext_lazy.
+    """
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    if any(isinstance(node, ast.ImportFrom) and node.names[-1].name == "gettext_lazy" for node in imports):
+        return None
+
+    if imports:
+        return imports[-1].end_lineno + 1, 0
+
+    match tree.body:
+        case []:
+            return 1, 0
+        case [ast.Expr(value=ast.Constant(value=str())) as docstring, *_]:
+            return docstring.end_lineno + 1, 0
+        case [first, *_]:
+            decorators = getattr(first, "decorator_list", [])
+            return min([first.lineno, *(decorator.lineno for decorator in decorators)]), 0
+    return None
+
+
+def apply_edits(source: bytes, edits: list[SourceEdit]) -> bytes:
+    """Splice the edits into the original source keeping all untouched bytes as is.
+
+    The insertions at the same position keep the order they were recorded in.
+
+    Args:
+        source (bytes): The original source.
+        edits (list[SourceEdit]): The edits to apply.
+
+    Returns:
+        bytes: The changed source.
+    """
+    offsets = get_line_offsets(source)
+
+    def to_offset(position: tuple[int, int]) -> int:
+        lineno, col_offset = position
+        if lineno >= len(offsets):
+            return len(source)
+        return offsets[lineno] + col_offset
+
+    ordered = sorted(
+        ((to_offset(edit.start), to_offset(edit.end), index, edit.text) for index, edit in enumerate(edits)),
+        reverse=True,
+    )
+    result = bytearray(source)
+    for start, end, _, text in ordered:
+        result[start:end] = text.encode()
+    return bytes(result)
+
+
+def rewrite_source(source: bytes, tree: ast.Module, edits: list[SourceEdit]) -> bytes:
+    """Rewrite the source with the recorded gettext edits and the gettext import.
+
+    Args:
+        source (bytes): The original source.
+        tree (ast.Module): The module parsed from the source.
+        edits (list[SourceEdit]): The gettext wrapping edits.
+
+    Returns:
+        bytes: The rewritten source.
+    """
+    position = find_import_position(tree)
+    if position is None:
+        return apply_edits(source, edits)
+
+    newline = "\r\n" if b"\r\n" in source else "\n"
+    at_end = position[0] >= len(get_line_offsets(source))
+    prefix = newline if at_end and source and not source.endswith((b"\n", b"\r")) else ""
+    import_edit = SourceEdit(start=position, end=position, text=f"{prefix}{GETTEXT_IMPORT}{newline}")
+    return apply_edits(source, [import_edit, *edits])
@@ -1,12 +1,80 @@
 import ast
 from _ast import stmt
+from collections import Counter
 from contextlib import suppress
 
+from django_translate_gettext.services.rewriters import (
+    SourceEdit,
+    end_of,
+    gettext_call_source,
+    has_position,
+    start_of,
+)
+
 
 class ClassDefTransformer(ast.NodeTransformer):
-    @staticmethod
-    def build_new_call_node(*, constant: str) -> ast.Call:
-        return ast.Call(func=ast.Name(id="_", ctx=ast.Load()), args=[ast.Constant(constant)], keywords=[])
+    def __init__(self) -> None:
+        super().__init__()
+        self.wraps = 0
+        self.wrap_types: Counter[str] = Counter()
+        self.node_type = "field"
+        self.edits: list[SourceEdit] = []
+        self.spliceable = True
+
+    def build_new_call_node(self, *, constant: str, location: ast.AST | None = None) -> ast.Call:
+        self.wraps += 1
+        self.wrap_types[self.node_type] += 1
+        node = ast.Call(func=ast.Name(id="_", ctx=ast.Load()), args=[ast.Constant(constant)], keywords=[])
+        if location is not None and has_position(location):
+            ast.copy_location(node, location)
+        return node
+
+    def wrap_constant_node(self, *, node: ast.Constant | ast.expr, constant: str | None = None) -> ast.Call:
+        """Build the gettext call for the constant node and record the source edit wrapping it.
+
+        Args:
+            node (ast.Constant): The constant node to wrap.
+            constant (str | None): The new constant value if it differs from the node value.
+
+        Returns:
+            ast.Call: The gettext call node.
+        """
+        value = node.value if constant is None else constant
+        if not has_position(node):
+            self.spliceable = False
+        elif value == node.value:
+            self.edits.append(SourceEdit(start=start_of(node), end=start_of(node), text="_("))
+            self.edits.append(SourceEdit(start=end_of(node), end=end_of(node), text=")"))
+        else:
+            self.edits.append(SourceEdit(start=start_of(node), end=end_of(node), text=gettext_call_source(value)))
+        return self.build_new_call_node(constant=value, location=node)
+
+    def insert_call_argument(self, *, call: ast.Call, constant: str, keyword: str | None, first: bool) -> ast.Call:
+        """Build the gettext call for the new call argument and record the source edit inserting it.
+
+        Args:
+            call (ast.Call): The call to insert the argument to.
+            constant (str): The constant to wrap.
+            keyword (str | None): The keyword name or None for the positional argument.
+            first (bool): Insert the keyword before the existing keywords instead of appending it.
+
+        Returns:
+            ast.Call: The gettext call node.
+        """
+        text = gettext_call_source(constant) if keyword is None else f"{keyword}={gettext_call_source(constant)}"
+        arguments = [node for node in (*call.args, *call.keywords) if has_position(node)]
+        keywords = [node for node in call.keywords if has_position(node)]
+        if not has_position(call) or len(arguments) != len(call.args) + len(call.keywords):
+            self.spliceable = False
+        elif first and keywords:
+            self.edits.append(SourceEdit(start=start_of(keywords[0]), end=start_of(keywords[0]), text=f"{text}, "))
+        elif arguments:
+            last = max(arguments, key=end_of)
+            self.edits.append(SourceEdit(start=end_of(last), end=end_of(last), text=f", {text}"))
+        else:
+            position = (call.end_lineno, call.end_col_offset - 1)
+            self.edits.append(SourceEdit(start=position, end=position, text=text))
+        return self.build_new_call_node(constant=constant, location=call)
 
     def build_args_node(self, *, args: list[ast.Dict | ast.Constant | ast.expr]) -> list[ast.Dict | ast.Constant]:
         if args and isinstance(args[0], ast.Dict):
@@ -16,12 +84,12 @@ class ClassDefTransformer(ast.NodeTransformer):
             if hasattr(param, "func"):
                 return args
 
-            new_node = self.build_new_call_node(constant=param.value)
+            new_node = self.wrap_constant_node(node=param)
             args[0].values[0] = new_node
             return args
         if args and isinstance(args[0], ast.Constant):
             constant = args[0]
-            new_node = self.build_new_call_node(constant=constant.value)
+            new_node = self.wrap_constant_node(node=constant)
             args[0] = new_node
         return args
 
@@ -31,20 +99,19 @@ class ClassDefTransformer(ast.NodeTransformer):
         message = next((keyword for keyword in keywords if keyword.arg == arg_name), None)
         if message and isinstance(message.value, ast.Constant):
             constant = message.value
-            new_node = self.build_new_call_node(constant=constant.value)
+            new_node = self.wrap_constant_node(node=constant)
             message.value = new_node
         return keywords
 
     def generate_tuple_gettext(self, *, value: ast.Tuple | stmt) -> ast.Tuple:
         last_constant = value.elts[-1]
         if isinstance(last_constant, ast.Constant):
-            value.elts[-1] = self.build_new_call_node(constant=last_constant.value)
+            value.elts[-1] = self.wrap_constant_node(node=last_constant)
         return value
 
     def generate_class_boby_gettext(self, *, body: ast.Assign, instance: ast.ClassDef | stmt):
         if isinstance(body.value, ast.Constant):
-            constant = body.value.value
-            new_node = self.build_new_call_node(constant=constant)
+            new_node = self.wrap_constant_node(node=body.value)
             body.value = new_node
 
         if isinstance(body.value, ast.Tuple) and body.value.elts:
@@ -55,6 +122,7 @@ class ClassDefTransformer(ast.NodeTransformer):
         return body
 
     def generate_class_gettext(self, *, instance: ast.ClassDef | stmt) -> ast.ClassDef:
+        self.node_type = "meta" if instance.name == "Meta" else "choices"
         for body in instance.body:
             if not isinstance(body, ast.Assign) or body.targets[-1].id == "abstract":
                 continue
@@ -67,7 +135,9 @@ class ClassDefTransformer(ast.NodeTransformer):
 
     def append_verbose_name(self, *, instance: ast.Assign | stmt) -> ast.Assign:
         constant = instance.targets[-1]
-        new_node = self.build_new_call_node(constant=constant.id.title())
+        new_node = self.insert_call_argument(
+            call=instance.value, constant=constant.id.title(), keyword="verbose_name", first=True
+        )
         instance.value.keywords.insert(0, ast.keyword(arg="verbose_name", value=new_node))
 
         return instance
@@ -80,14 +150,16 @@ class ClassDefTransformer(ast.NodeTransformer):
             constant = verbose.value
             if not isinstance(constant, ast.Constant):
                 return instance
-            new_node = self.build_new_call_node(constant=constant.value)
+            new_node = self.wrap_constant_node(node=constant)
             verbose.value = new_node
         return instance
 
     def generate_assign_args_gettext(self, *, instance: ast.Assign | stmt) -> ast.Assign:
         if not instance.value.args and not instance.value.keywords:
             constant = instance.targets[-1]
-            new_node = self.build_new_call_node(constant=constant.id.title())
+            new_node = self.insert_call_argument(
+                call=instance.value, constant=constant.id.title(), keyword=None, first=False
+            )
             instance.value.args.append(new_node)
             return instance
 
@@ -100,7 +172,7 @@ class ClassDefTransformer(ast.NodeTransformer):
             constant = keyword.value
             if not isinstance(constant, ast.Constant):
                 return keyword
-            new_node = self.build_new_call_node(constant=constant.value)
+            new_node = self.wrap_constant_node(node=constant)
             keyword.value = new_node
         return keyword
 
@@ -118,6 +190,7 @@ class ClassDefTransformer(ast.NodeTransformer):
         return instance
 
     def generate_assign_gettext(self, *, instance: ast.Assign | stmt) -> ast.Assign:
+        self.node_type = "field"
         if instance.targets[-1].id == "objects":
             return instance
 
@@ -145,20 +218,19 @@ class ClassDefTransformer(ast.NodeTransformer):
         for keyword in decorator.keywords:
             if keyword.arg == "description" and isinstance(keyword.value, ast.Constant):
                 constant = keyword.value
-                new_node = self.build_new_call_node(constant=constant.value.title())
+                new_node = self.wrap_constant_node(node=constant, constant=constant.value.title())
                 keyword.value = new_node
 
         description = next((keyword for keyword in decorator.keywords if keyword.arg == "description"), None)
         if description is None:
-            decorator.keywords.append(
-                ast.keyword(
-                    arg="description",
-                    value=self.build_new_call_node(constant=instance_name.replace("_", " ").title()),
-                )
+            new_node = self.insert_call_argument(
+                call=decorator, constant=instance_name.replace("_", " ").title(), keyword="description", first=False
             )
+            decorator.keywords.append(ast.keyword(arg="description", value=new_node))
         return decorator
 
     def generate_display_decorator_gettext(self, *, instance: ast.FunctionDef | stmt) -> ast.FunctionDef:
+        self.node_type = "display"
         decorators = instance.decorator_list
         for decorator in decorators:
             if not isinstance(decorator, ast.Call) and (
@@ -194,6 +266,7 @@ class ClassDefTransformer(ast.NodeTransformer):
         return instance
 
     def generate_funcdef_raising_gettext(self, *, instance: ast.FunctionDef | stmt) -> ast.FunctionDef:
+        self.node_type = "validation_error"
         for body in instance.body:
             for item in body.body:
                 if not isinstance(item, ast.Raise):
@@ -204,13 +277,12 @@ class ClassDefTransformer(ast.NodeTransformer):
 
     @staticmethod
     def insert_getetxt_import(node: ast.Module) -> ast.Module:
-        aliases = [body.names[-1].name for body in node.body if isinstance(body, ast.ImportFrom)]
-        if "gettext_lazy" in aliases:
-            return node
-
-        counted_imports = len([
-            import_node for import_node in node.body if isinstance(import_node, (ast.ImportFrom, ast.Import))
-        ])
+        counted_imports = 0
+        for body in node.body:
+            if isinstance(body, ast.ImportFrom) and body.names[-1].name == "gettext_lazy":
+                return node
+            if isinstance(body, (ast.ImportFrom, ast.Import)):
+                counted_imports += 1
 
         import_node = ast.ImportFrom(
             module="django.utils.translation",
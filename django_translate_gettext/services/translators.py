@@ -1,56 +1,372 @@
-import re
+import concurrent.futures
+import functools
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import NamedTuple
 
-from deep_translator import GoogleTranslator
-from deep_translator.exceptions import LanguageNotSupportedException
+from deep_translator.exceptions import RequestError, TooManyRequests, TranslationNotFound
 from django.conf import settings
 
+from django_translate_gettext.constants import (
+    BATCH_BACKOFF,
+    BATCH_CHUNK_SIZE,
+    BATCH_DELIMITER,
+    BATCH_MAX_CHARS,
+    BATCH_RETRIES,
+    BATCH_WORKERS,
+    CHECKPOINT_EVERY,
+    CHECKPOINT_INTERVAL,
+    JOURNAL_PATH,
+)
 from django_translate_gettext.exceptions import TranslatorError
+from django_translate_gettext.services.backends import get_backend, get_backend_name
+from django_translate_gettext.services.checkpoints import Checkpoint, TranslationJournal
+from django_translate_gettext.services.manifest import Manifest
+from django_translate_gettext.services.memory import TranslationMemory
+from django_translate_gettext.services.po import iter_po_file, write_po_file
+from django_translate_gettext.services.progress import ProgressTracker
+
+RETRY_ERRORS = (RequestError, TooManyRequests, TranslationNotFound)
+
+
+def keep_whitespace(msgid: str, text: str) -> str:
+    """Replace the leading and trailing whitespace of the translated part of the joined payload with the msgid's one.
+
+    The whitespace around the delimiter is changed by the translator, so the msgid's own spacing like "Total: "
+    is applied to the translation instead.
+
+    Args:
+        msgid (str): The msgid.
+        text (str): The translated part of the payload.
+
+    Returns:
+        str: The translated string.
+    """
+    stripped = text.strip()
+    if not stripped or not msgid.strip():
+        return stripped
+    leading = msgid[: len(msgid) - len(msgid.lstrip())]
+    trailing = msgid[len(msgid.rstrip()) :]
+    return f"{leading}{stripped}{trailing}"
+
+
+class Catalog(NamedTuple):
+    po_file: Path
+    msgids: list[str]
 
 
 class PoFileTranslator:
-    def __init__(self, lang_code: str):
+    def __init__(  # noqa: PLR0913
+        self,
+        lang_code: str,
+        *,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        workers: int = BATCH_WORKERS,
+        retries: int = BATCH_RETRIES,
+        memory: TranslationMemory | None = None,
+        manifest: Manifest | None = None,
+        backend: str | None = None,
+        progress: ProgressTracker | None = None,
+        resume: bool = False,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+        checkpoint_interval: float = CHECKPOINT_INTERVAL,
+    ):
         self.lang_code = lang_code
+        self.chunk_size = max(chunk_size, 1)
+        self.workers = max(workers, 1)
+        self.retries = max(retries, 0)
+        self.memory = memory
+        self.manifest = manifest
+        self.progress = progress or ProgressTracker()
+        self.resume = resume
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
         self.locale_paths = [Path(filepath) for filepath in settings.LOCALE_PATHS]
-        try:
-            self.translator = GoogleTranslator(source="auto", target=lang_code)
-        except LanguageNotSupportedException as error:
-            raise TranslatorError(f"Language code {lang_code} is not supported by the translator") from error
-
-    def translate_block(self, block: str, msgid: list[str]) -> str:
-        msgstr = re.findall(r'msgstr "(.*?)"', block)
-        if msgstr and msgstr[0]:
-            return block
-        translated = self.translator.translate(msgid[0])
-        return re.sub(r'msgstr "(.*?)*"', f'msgstr "{translated}"', block)
-
-    def process_first_block(self, block: str) -> str:
-        parts = block.split("\n")
-        raw_msgid, raw_msgstr = parts[-2], parts[-1]
-        msgid = re.findall(r'msgid "(.*?)"', raw_msgid)
-        parts[-1] = self.translate_block(block=raw_msgstr, msgid=msgid)
-        return "\n".join(parts)
-
-    def translate_locale_path(self, *, locale_path: Path) -> None:
-        result = []
+        self.backend = get_backend_name(backend)
+        self.translator = get_backend(self.backend, target=lang_code)
+        self.source_lang = self.translator.source
+
+    def chunk_msgids(self, msgids: list[str]) -> list[list[str]]:
+        """Split the msgids to the chunks bounded by the chunk size and the translator payload length.
+
+        Args:
+            msgids (list[str]): The msgids to split.
+
+        Returns:
+            list[list[str]]: The list of chunks.
+        """
+        chunks, chunk, length = [], [], 0
+        for msgid in msgids:
+            size = len(msgid) + len(BATCH_DELIMITER)
+            if chunk and (len(chunk) >= self.chunk_size or length + size > BATCH_MAX_CHARS):
+                chunks.append(chunk)
+                chunk, length = [], 0
+            chunk.append(msgid)
+            length += size
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def translate_text(self, text: str) -> str:
+        """Translate the text, retrying the failed requests with the exponential backoff.
+
+        Args:
+            text (str): The text to translate.
+
+        Returns:
+            str: The translated text.
+        """
+        for attempt in range(self.retries + 1):
+            self.progress.add_request(self.lang_code, retry=attempt > 0)
+            try:
+                return self.translator.translate(text)
+            except RETRY_ERRORS as error:
+                if attempt == self.retries:
+                    raise TranslatorError(f"Failed to translate for lang code {self.lang_code}: {error}") from error
+                time.sleep(BATCH_BACKOFF * 2**attempt)
+        return ""
+
+    @staticmethod
+    def split_chunk(chunk: list[str]) -> tuple[list[str], list[str]]:
+        """Split the chunk to the msgids to translate one by one and the msgids to join to the single payload.
+
+        Args:
+            chunk (list[str]): The msgids to split.
+
+        Returns:
+            tuple[list[str], list[str]]: The msgids containing the delimiter and the msgids to join.
+        """
+        single = [msgid for msgid in chunk if BATCH_DELIMITER in msgid]
+        joined = [msgid for msgid in chunk if BATCH_DELIMITER not in msgid]
+        return single, joined
+
+    @staticmethod
+    def map_translated(joined: list[str], translated: str) -> dict[str, str] | None:
+        """Map the translated joined payload back to the msgids.
+
+        Args:
+            joined (list[str]): The joined msgids.
+            translated (str): The translated payload.
+
+        Returns:
+            dict[str, str] | None: The mapping of the msgids to the translated strings or None if the payload
+                can't be split back to the msgids.
+        """
+        parts = translated.split(BATCH_DELIMITER)
+        if len(parts) != len(joined):
+            return None
+        return {msgid: keep_whitespace(msgid, text) for msgid, text in zip(joined, parts, strict=True)}
+
+    def translate_chunk(self, chunk: list[str]) -> dict[str, str]:
+        """Translate the chunk of msgids joined to the single payload.
+
+        The msgids containing the delimiter are translated one by one, as well as the whole chunk if the translated
+        payload can't be split back to the msgids.
+
+        Args:
+            chunk (list[str]): The msgids to translate.
+
+        Returns:
+            dict[str, str]: The mapping of the msgids to the translated strings.
+        """
+        single, joined = self.split_chunk(chunk)
+        result = {msgid: self.translate_text(msgid) for msgid in single}
+        if len(joined) > 1:
+            translated = self.map_translated(joined, self.translate_text(BATCH_DELIMITER.join(joined)))
+            if translated is not None:
+                return result | translated
+
+        return result | {msgid: self.translate_text(msgid) for msgid in joined}
+
+    def translate_msgids(self, msgids: list[str], *, checkpoint: Checkpoint | None = None) -> dict[str, str]:
+        """Translate the msgids by the chunks in the thread pool, looking up the translation memory first.
+
+        Args:
+            msgids (list[str]): The msgids to translate.
+            checkpoint (Checkpoint | None): The checkpoint to journal the translated chunks to.
+
+        Returns:
+            dict[str, str]: The mapping of the msgids to the translated strings.
+        """
+        msgids = list(dict.fromkeys(msgids))
+        self.progress.add_total(self.lang_code, "translate", len(msgids))
+        result = self.fetch_cached(msgids, checkpoint=checkpoint)
+        self.progress.advance(self.lang_code, "translate", len(result))
+        chunks = self.chunk_msgids([msgid for msgid in msgids if msgid not in result])
+        if not chunks:
+            return result
+
+        translated = {}
+        max_workers = min(self.workers, len(chunks))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.translate_chunk, chunk) for chunk in chunks]
+            collected = set()
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    chunk_result = future.result()
+                    translated.update(chunk_result)
+                    self.progress.advance(self.lang_code, "translate", len(chunk_result))
+                    collected.add(future)
+                    if checkpoint is not None and checkpoint.add(chunk_result):
+                        checkpoint.flush()
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                if checkpoint is not None:
+                    for future in futures:
+                        if future not in collected and self.is_chunk_translated(future):
+                            checkpoint.add(future.result())
+                raise
+
+        self.store_memory(translated)
+        return result | translated
+
+    @staticmethod
+    def is_chunk_translated(future: concurrent.futures.Future) -> bool:
+        return future.done() and not future.cancelled() and future.exception() is None
+
+    def fetch_cached(self, msgids: list[str], *, checkpoint: Checkpoint | None = None) -> dict[str, str]:
+        """Get the translations from the journal of the resumed run and from the translation memory.
+
+        Args:
+            msgids (list[str]): The msgids to look up.
+            checkpoint (Checkpoint | None): The checkpoint with the journal of the resumed run.
+
+        Returns:
+            dict[str, str]: The mapping of the found msgids to the translated strings.
+        """
+        journaled = {}
+        if checkpoint is not None and checkpoint.journal.entries:
+            journaled = {
+                msgid: checkpoint.journal.entries[msgid] for msgid in msgids if msgid in checkpoint.journal.entries
+            }
+        return journaled | self.fetch_memory([msgid for msgid in msgids if msgid not in journaled])
+
+    def fetch_memory(self, msgids: list[str]) -> dict[str, str]:
+        if self.memory is None or not msgids:
+            return {}
+        result = self.memory.get_many(
+            msgids, source_lang=self.source_lang, target_lang=self.lang_code, backend=self.backend
+        )
+        self.progress.add_cache(self.lang_code, hits=len(result), misses=len(msgids) - len(result))
+        return result
+
+    def store_memory(self, translations: dict[str, str]) -> None:
+        if self.memory is None or not translations:
+            return
+        self.memory.set_many(
+            translations, source_lang=self.source_lang, target_lang=self.lang_code, backend=self.backend
+        )
+
+    def get_po_file(self, *, locale_path: Path) -> Path:
         po_file = locale_path.joinpath(self.lang_code, "LC_MESSAGES", "django.po")
         if not po_file.exists():
             raise TranslatorError(f"The file for code {self.lang_code} does not exist.")
+        return po_file
 
-        file_content = po_file.read_text().split("\n\n")
-        for block in file_content:
-            if not block:
-                continue
+    @staticmethod
+    def fetch_msgids(po_file: Path) -> list[str]:
+        return list(dict.fromkeys(msgid for entry in iter_po_file(po_file) for msgid in entry.source_texts))
+
+    @staticmethod
+    def fill_po_file(po_file: Path, translations: dict[str, str]) -> None:
+        write_po_file(po_file, (entry.translate(translations) for entry in iter_po_file(po_file)))
+
+    def is_catalog_unchanged(self, po_file: Path) -> bool:
+        return self.manifest is not None and self.manifest.is_unchanged(po_file, kind="catalogs")
+
+    def record_catalog(self, po_file: Path, msgids: list[str], translations: dict[str, str]) -> None:
+        """Record the catalog hash to the manifest if all its msgids were translated.
+
+        Args:
+            po_file (Path): The translated po file.
+            msgids (list[str]): The msgids that were pending for the translation.
+            translations (dict[str, str]): The mapping of the msgids to the translated strings.
 
-            msgid = re.findall(r'msgid "(.*?)"', block)
-            if len(msgid) != 1:
-                result.append(self.process_first_block(block=block))
+        Returns:
+            None
+        """
+        if self.manifest is not None and all(translations.get(msgid) for msgid in msgids):
+            self.manifest.update(po_file, kind="catalogs")
+
+    def plan_catalogs(self) -> list[Catalog]:
+        """Collect the catalogs to translate for all locale paths with their untranslated msgids.
+
+        The unchanged catalogs are skipped, the catalogs without the untranslated msgids are recorded at once.
+
+        Returns:
+            list[Catalog]: The catalogs with the msgids to translate.
+        """
+        catalogs = []
+        self.progress.add_total(self.lang_code, "plan", len(self.locale_paths))
+        for locale_path in self.locale_paths:
+            po_file = self.get_po_file(locale_path=locale_path)
+            self.progress.advance(self.lang_code, "plan")
+            if self.is_catalog_unchanged(po_file):
                 continue
 
-            result.append(self.translate_block(block=block, msgid=msgid))
+            msgids = self.fetch_msgids(po_file)
+            if msgids:
+                catalogs.append(Catalog(po_file=po_file, msgids=msgids))
+            else:
+                self.record_catalog(po_file, msgids, {})
+        return catalogs
+
+    @staticmethod
+    def unique_msgids(catalogs: list[Catalog]) -> list[str]:
+        return list(dict.fromkeys(msgid for catalog in catalogs for msgid in catalog.msgids))
+
+    def fill_catalogs(self, catalogs: list[Catalog], translations: dict[str, str]) -> None:
+        self.progress.add_total(self.lang_code, "write", len(catalogs))
+        for catalog in catalogs:
+            self.fill_po_file(catalog.po_file, translations)
+            self.record_catalog(catalog.po_file, catalog.msgids, translations)
+            self.progress.advance(self.lang_code, "write")
+
+    def get_journal_path(self) -> Path:
+        journal_path = Path(getattr(settings, "TRANSLATE_GETTEXT_JOURNAL_PATH", JOURNAL_PATH))
+        return journal_path.joinpath(f"{self.backend}.{self.lang_code}.jsonl")
 
-        po_file.write_text("\n\n".join(result))
+    def write_checkpoint(self, catalogs: list[Catalog], translations: dict[str, str]) -> None:
+        self.store_memory(translations)
+        for catalog in catalogs:
+            self.fill_po_file(catalog.po_file, translations)
+
+    @contextmanager
+    def open_checkpoint(self, catalogs: list[Catalog]) -> Iterator[Checkpoint]:
+        """Open the journal of the lang code and checkpoint the translations to the catalogs.
+
+        The journal is removed when the catalogs are filled, the pending translations are flushed to the catalogs
+        and the journal is kept for the --resume run if the translation fails.
+
+        Args:
+            catalogs (list[Catalog]): The catalogs to checkpoint the translations to.
+
+        Returns:
+            Iterator[Checkpoint]: The checkpoint.
+        """
+        journal = TranslationJournal(self.get_journal_path(), resume=self.resume)
+        checkpoint = Checkpoint(
+            functools.partial(self.write_checkpoint, catalogs),
+            journal=journal,
+            every=self.checkpoint_every,
+            interval=self.checkpoint_interval,
+        )
+        try:
+            yield checkpoint
+        except BaseException:
+            checkpoint.flush()
+            journal.close()
+            raise
+        journal.close(remove=True)
 
     def translate_codes(self) -> None:
-        for locale_path in self.locale_paths:
-            self.translate_locale_path(locale_path=locale_path)
+        """Translate the catalogs of all locale paths, every unique msgid is translated once for all of them."""
+        catalogs = self.plan_catalogs()
+        if not catalogs:
+            return
+
+        with self.open_checkpoint(catalogs) as checkpoint:
+            translations = self.translate_msgids(self.unique_msgids(catalogs), checkpoint=checkpoint)
+            self.fill_catalogs(catalogs, translations)
@@ -0,0 +1,33 @@
+import asyncio
+import time
+import unittest
+
+from django_translate_gettext.services.pipeline import TokenBucket
+
+
+class TokenBucketTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_pause_resumes_at_rate(self) -> None:
+        rate, capacity, delay = 20.0, 10, 0.5
+        bucket = TokenBucket(rate=rate, capacity=capacity)
+        started_at = time.monotonic()
+        bucket.pause(delay)
+
+        times = []
+        for _ in range(capacity):
+            await bucket.acquire()
+            times.append(time.monotonic() - started_at)
+
+        self.assertGreaterEqual(times[0], delay)
+        for previous, current in zip(times, times[1:], strict=False):
+            self.assertGreaterEqual(current - previous, 0.9 / rate)
+        self.assertGreaterEqual(times[-1], delay + 0.9 * capacity / rate)
+
+    async def test_burst_without_pause(self) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=5)
+        started_at = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        self.assertLess(time.monotonic() - started_at, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
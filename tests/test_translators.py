@@ -0,0 +1,16 @@
+import unittest
+
+from django_translate_gettext.services.translators import PoFileTranslator
+
+
+class MapTranslatedTestCase(unittest.TestCase):
+    def test_keeps_msgid_whitespace(self) -> None:
+        translated = PoFileTranslator.map_translated(["Total: ", " Name", "City"], "Gesamt:  \n  Name\n Stadt ")
+        self.assertEqual(translated, {"Total: ": "Gesamt: ", " Name": " Name", "City": "Stadt"})
+
+    def test_mismatched_parts(self) -> None:
+        self.assertIsNone(PoFileTranslator.map_translated(["One", "Two"], "Eins"))
+
+
+if __name__ == "__main__":
+    unittest.main()